@@ -6,19 +6,27 @@ Drop in a dataset and DataLite writes its front page: a lead story for the
 strongest finding, then a grid of smaller stories — each one computed directly
 from your full data (no LLM, no API key) and verifiable on the spot.
 
-Presentation lives in render.py; the analysis engine in insight_engine.py.
+Presentation lives in render.py; the analysis engine in insight_engine.py;
+the optional chat client in chat.py.
 """
 
+import base64
+import json
+import os
 import re
+import time
 from datetime import datetime
 from io import StringIO
+from pathlib import Path
+from typing import Optional
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import requests
-import seaborn as sns
 import streamlit as st
+import streamlit.components.v1 as components
 
+import chat
+import ingest
 import insight_engine as ie
 import render
 
@@ -31,6 +39,53 @@ st.set_page_config(
 
 st.markdown(render.CSS, unsafe_allow_html=True)
 
+# CSV uploads above this size are analysed chunk by chunk instead of being
+# loaded whole; only a preview of the first rows is kept in memory
+STREAM_BYTES = 200 * 1024**2
+STREAM_CHUNK_ROWS = 200_000
+PREVIEW_ROWS = 1_000
+# "Watch a file": offered only when the server names a directory of CSVs
+# that visitors may follow; how often a watched file is checked for new rows
+WATCH_DIR = os.environ.get("DATALITE_WATCH_DIR")
+WATCH_SECONDS = 5
+# "fast front page": tables longer than this are screened on a sample and
+# only the winning findings are recomputed on every row
+SAMPLE_ROWS = 250_000
+# seconds the front page waits for the analysis; it goes to print with the
+# best findings ready by then
+ANALYSIS_BUDGET = 20.0
+# how front-page charts are shipped to the browser (see render.CHART_MODE)
+CHART_MODES = {"Images": "png", "Thumbnails": "thumb",
+               "Interactive (Vega-Lite)": "vega"}
+
+
+@st.cache_resource
+def chat_client(api_key: str) -> chat.ChatClient:
+    """One pooled client (and answer cache) per key, kept across reruns."""
+    return chat.ChatClient(api_key)
+
+
+def watchable(name: str) -> Optional[Path]:
+    """`name` in WATCH_DIR, or None if it resolves anywhere else (through
+    "..", an absolute path or a symlink)."""
+    root = Path(WATCH_DIR).resolve()
+    path = (root / name).resolve()
+    return path if path.is_relative_to(root) and path.is_file() else None
+
+
+@st.fragment(run_every=WATCH_SECONDS)
+def watch_for_growth(tail: ingest.CsvTail) -> None:
+    """Rerun the script once the watched file has grown past what `tail`
+    has read. Runs on its own every WATCH_SECONDS and returns right away,
+    so the page stays responsive while nothing changes."""
+    try:
+        grown = os.path.getsize(tail.path) > tail.offset
+    except OSError:
+        grown = True  # let the rerun report what happened to the file
+    if grown:
+        st.rerun(scope="app")
+
+
 SAMPLE_CSV = """Name,Age,Gender,Score,Passed
 Alice,23,Female,85,Yes
 Bob,25,Male,75,Yes
@@ -44,11 +99,37 @@ Fay,26,Female,88,Yes"""
 # --------------------------------------------------------------------------- #
 with st.sidebar:
     st.title("Data source")
-    data_source = st.radio("Source", ("Use sample data", "Upload CSV"),
-                           label_visibility="collapsed")
-    uploaded_file = None
-    if data_source == "Upload CSV":
-        uploaded_file = st.file_uploader("Upload a CSV", type=["csv"])
+    sources = ("Use sample data", "Upload a file")
+    if WATCH_DIR:
+        sources += ("Watch a file",)
+    data_source = st.radio("Source", sources, label_visibility="collapsed")
+    uploaded_file = watch_path = None
+    if data_source == "Upload a file":
+        uploaded_file = st.file_uploader(
+            "Upload a CSV, Parquet or Feather file",
+            type=[ext.lstrip(".") for ext in ingest.FORMATS])
+    elif data_source == "Watch a file":
+        choice = st.selectbox(
+            "Append-only CSV to follow",
+            sorted(p.name for p in Path(WATCH_DIR).glob("*.csv")),
+            index=None, placeholder=f"a CSV in {WATCH_DIR}",
+            help="New rows are folded in as the file grows and the edition "
+                 f"is reprinted (checked every {WATCH_SECONDS}s).")
+        if choice is not None:
+            watch_path = watchable(choice)
+            if watch_path is None:
+                st.error("That file is outside the watch directory.")
+    fast = st.toggle("Fast front page on big tables", value=True,
+                     help=f"Tables over {SAMPLE_ROWS:,} rows are screened on "
+                          "a sample; the findings that make the front page "
+                          "are then recomputed exactly on every row.")
+    diagnose = st.toggle("Diagnostics", value=False,
+                         help="Time and memory-profile every detector and "
+                              "chart. Detectors then run one at a time.")
+    chart_mode = CHART_MODES[st.selectbox(
+        "Charts", list(CHART_MODES),
+        help="Thumbnails and interactive charts are much lighter to send; "
+             "pick one of them on a slow connection.")]
 
     st.markdown("---")
     with st.expander("Optional · AI narration (Groq)"):
@@ -63,13 +144,64 @@ with st.sidebar:
 # Load
 # --------------------------------------------------------------------------- #
 df = None
+stream = None
+report = None
 if data_source == "Use sample data":
     df = pd.read_csv(StringIO(SAMPLE_CSV))
+elif watch_path:
+    try:
+        # the analyzer lives in the session and only ever sees new rows
+        key = f"watch:{watch_path}"
+        if key not in st.session_state:
+            st.session_state[key] = (ingest.CsvTail(watch_path),
+                                     ie.StreamAnalyzer(), [])
+        tail, stream, preview = st.session_state[key]
+        with st.spinner("Reading new rows…"):
+            while (batch := tail.read_new(max_bytes=STREAM_BYTES)) is not None:
+                if not preview:
+                    preview.append(batch.head(PREVIEW_ROWS))
+                stream.update(batch)
+        df = preview[0] if preview else None
+    except Exception as e:
+        st.session_state.pop(f"watch:{watch_path}", None)
+        st.error(f"Couldn't follow that file: {e}")
+        df = stream = None
 elif uploaded_file is not None:
     try:
-        df = pd.read_csv(uploaded_file)
+        if (uploaded_file.size > STREAM_BYTES
+                and ingest.file_format(uploaded_file.name) == "csv"):
+            # read once per upload: reruns reuse the merged statistics
+            key = f"stream:{uploaded_file.file_id}"
+            if key not in st.session_state:
+                for old in [k for k in st.session_state
+                            if str(k).startswith("stream:")]:
+                    del st.session_state[old]  # a previous upload's
+                stream, preview = ie.StreamAnalyzer(), None
+                with st.spinner("Reading a large file in chunks…"):
+                    for chunk in pd.read_csv(uploaded_file,
+                                             chunksize=STREAM_CHUNK_ROWS):
+                        if preview is None:
+                            preview = chunk.head(PREVIEW_ROWS)
+                        stream.update(chunk)
+                st.session_state[key] = (stream, preview)
+            stream, df = st.session_state[key]
+        else:
+            # hash each upload once per session; the parsed frame itself is
+            # memory-mapped from the on-disk cache on every rerun
+            key = f"digest:{uploaded_file.file_id}"
+            if key not in st.session_state:
+                st.session_state[key] = ingest.digest(uploaded_file)
+            with st.spinner("Reading your file…"):
+                df, report = ingest.read_cached(uploaded_file,
+                                                uploaded_file.name,
+                                                key=st.session_state[key])
     except Exception as e:
-        st.error(f"Couldn't read that CSV: {e}")
+        st.error(f"Couldn't read that file: {e}")
+        df = stream = None
+
+if stream is not None and stream.coerced:
+    st.warning("Read as numbers although later rows hold text, which counts "
+               "as missing: " + ", ".join(sorted(stream.coerced)))
 
 if df is None:
     st.markdown(
@@ -77,30 +209,114 @@ if df is None:
         "<div class='wordmark'><span class='spark'>✦</span> DataLite</div>"
         "<div class='dateline'>Your data — read all about it</div></div>"
         "<div class='rule'></div><div class='rule thin'></div>"
-        "<div class='quiet'>Upload a CSV or pick “Use sample data” in the "
+        "<div class='quiet'>Upload a file or pick “Use sample data” in the "
         "sidebar to print today's edition.</div>",
         unsafe_allow_html=True,
     )
+    if watch_path and stream is not None:  # no rows yet
+        watch_for_growth(tail)
     st.stop()
 
 # --------------------------------------------------------------------------- #
 # Front page: masthead + chips + insight cards (one HTML block)
 # --------------------------------------------------------------------------- #
-summary = ie.dataset_summary(df)
 with st.spinner("Reading your data…"):
-    findings = ie.analyze(df, limit=8)
+    if stream is not None:
+        # findings come from the merged chunk statistics; `df` is a preview
+        profile, frame = stream.profile(), None
+    else:
+        profile, frame = ie.DatasetProfile.from_frame(df), df
+    summary = ie.dataset_summary(frame, profile=profile)
 
 try:
     date_str = datetime.now().strftime("%A, %B %-d, %Y")
 except ValueError:  # some platforms lack the %-d directive
     date_str = datetime.now().strftime("%A, %B %d, %Y")
 
-st.markdown(
-    render.masthead_html(summary, len(findings), date_str)
+# The page is typeset while the detectors run: every progress report is
+# shown at once with whatever charts are cached, then again once the rest
+# are drawn. Vega-Lite charts wait for the final edition.
+page, status = st.empty(), st.empty()
+typeset = False
+
+
+def show_progress(partial: ie.Analysis) -> None:
+    global typeset
+    n_done = len(partial.runs)
+    status.caption(f"Still reading — {n_done} of {len(ie.DETECTORS)} checks "
+                   "in…" if n_done < len(ie.DETECTORS) else
+                   "Checking the top stories against every row…")
+    head = render.masthead_html(summary, len(partial.findings), date_str) \
+        + render.chips_html(summary)
+    for pending in (True,) if chart_mode == "vega" else (True, False):
+        page.markdown(head + render.insights_html(
+            partial.findings, frame, mode=chart_mode, pending=pending,
+            animate=not typeset, fingerprints=profile.fingerprints),
+            unsafe_allow_html=True)
+        typeset = True
+
+
+analysis = ie.run_analysis(frame, limit=8, profile=profile,
+                           sample_rows=SAMPLE_ROWS if fast else None,
+                           instrument=diagnose, budget=ANALYSIS_BUDGET,
+                           progress=show_progress)
+findings = analysis.findings
+status.empty()
+
+payload: list[dict] = []
+stories = render.insights_html(findings, frame, mode=chart_mode,
+                               payload=payload, animate=not typeset,
+                               fingerprints=profile.fingerprints)
+head = render.masthead_html(summary, len(findings), date_str) \
     + render.chips_html(summary)
-    + render.insights_html(findings, df),
-    unsafe_allow_html=True,
-)
+if chart_mode == "vega":
+    # Vega-Lite draws in the browser, which needs scripts: give the stories
+    # their own frame
+    with page.container():
+        st.markdown(head, unsafe_allow_html=True)
+        components.html(render.CSS + stories, scrolling=True,
+                        height=480 + 420 * ((len(findings) + 1) // 3))
+else:
+    page.markdown(head + stories, unsafe_allow_html=True)
+
+if analysis.sample_rows:
+    st.caption(f"Screened on a {analysis.sample_rows:,}-row sample. Open "
+               "“Verify the numbers” on any story to see whether it was "
+               "recomputed on every row (exact) or is a sample estimate.")
+if analysis.partial:
+    st.caption(f"Went to print after {ANALYSIS_BUDGET:.0f} seconds, before "
+               "every sampled story could be rechecked; those still carry "
+               "sample estimates.")
+if payload:
+    total = sum(p["bytes"] for p in payload) / 1024
+    per_story = ", ".join(f"{p['bytes'] / 1024:,.1f}" for p in payload
+                          if p["headline"] is not None)
+    st.caption(f"Front page: {total:,.0f} KB of HTML ({per_story} KB per "
+               "story).")
+if report is not None and report.bytes_saved > 0:
+    st.caption(f"Stored in {report.bytes_after / 1024**2:,.1f} MB instead of "
+               f"{report.bytes_before / 1024**2:,.1f} MB "
+               f"({len(report.changed)} column(s) re-typed on load).")
+if analysis.dropped:
+    st.caption("Left off this edition: " + ", ".join(
+        f"{r.name.removeprefix('detect_').replace('_', ' ')} "
+        f"({'ran out of time' if r.status == 'timeout' else 'failed'})"
+        for r in analysis.dropped))
+
+if diagnose:
+    with st.expander("Diagnostics"):
+        diag = {"analysis": analysis.diagnostics(), "charts": payload}
+        st.markdown("**Detectors**")
+        st.dataframe(pd.DataFrame(diag["analysis"]["detectors"])
+                     .drop(columns="traceback"), width="stretch")
+        for r in analysis.dropped:
+            if r.traceback:
+                st.code(r.traceback, language="text")
+        st.markdown("**Charts**")
+        st.dataframe(pd.DataFrame(payload), width="stretch")
+        st.download_button("Export as JSON", json.dumps(diag, indent=1),
+                           file_name="datalite-diagnostics.json",
+                           mime="application/json")
 
 st.write("")
 
@@ -108,34 +324,39 @@ st.write("")
 # Classic EDA (manual exploration)
 # --------------------------------------------------------------------------- #
 with st.expander("Explore the data yourself"):
+    if watch_path:
+        st.caption(f"Following {watch_path.name} — showing the first "
+                   f"{len(df):,} of {stream.n_rows:,} rows so far.")
+    elif stream is not None:
+        st.caption(f"This file is too large to load whole — showing the "
+                   f"first {len(df):,} of {stream.n_rows:,} rows.")
     st.markdown("**Preview**")
     st.dataframe(df.head(20), width="stretch")
 
-    st.markdown("**Summary statistics**")
-    st.dataframe(df.describe(include="all").T, width="stretch")
+    # expanders run their body even when closed: the rest waits for the toggle
+    if st.toggle("Column statistics and charts", key="explore"):
+        # read off the profile the front page already built
+        stats = ie.column_summary(frame, profile=profile)
+        st.markdown("**Summary statistics**")
+        st.dataframe(stats, width="stretch")
 
-    st.markdown("**Missing values**")
-    st.dataframe(
-        df.isnull().sum().reset_index().rename(
-            columns={"index": "Column", 0: "Missing count"}),
-        width="stretch",
-    )
+        st.markdown("**Missing values**")
+        gaps = stats.loc[stats["missing"] > 0, ["missing", "missing %"]]
+        if gaps.empty:
+            st.caption("No missing values.")
+        else:
+            st.dataframe(gaps, width="stretch")
 
-    st.markdown("**Visualize a column**")
-    sns.set_theme(style="whitegrid")
-    selected = st.selectbox("Column", df.columns, label_visibility="collapsed")
-    fig, ax = plt.subplots(figsize=(6, 3))
-    if pd.api.types.is_numeric_dtype(df[selected]) and not \
-            pd.api.types.is_bool_dtype(df[selected]):
-        sns.histplot(df[selected].dropna(), kde=True, ax=ax, color=render.ACCENT)
-    else:
-        order = [str(o) for o in df[selected].value_counts().index[:15]]
-        sns.countplot(y=df[selected].astype(str), order=order, ax=ax,
-                      color="#2C5478")
-    fig.patch.set_alpha(0); ax.patch.set_alpha(0)
-    fig.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+        st.markdown("**Visualize a column**")
+        selected = st.selectbox("Column", df.columns,
+                                label_visibility="collapsed")
+        counts = None
+        if frame is not None:
+            p = profile.columns[selected]
+            if p.kind != "numeric" and p.uniques is not None:
+                counts = profile.value_counts(selected)
+        st.image(base64.b64decode(render.column_chart_b64(
+            df[selected], profile.fingerprints.get(selected), counts)))
 
 # --------------------------------------------------------------------------- #
 # Experimental chat (optional Groq; code shown, never auto-run)
@@ -156,33 +377,37 @@ with st.expander("Ask a question · experimental"):
                 f"DATA (first 10 rows):\n{df.head(10).to_csv(index=False)}\n\n"
                 f"QUESTION:\n{q}"
             )
+            # answers are cached per dataset, not per preview
+            data_key = (json.dumps(profile.fingerprints, sort_keys=True)
+                        if profile.fingerprints else
+                        f"{watch_path or uploaded_file.name}:{profile.n_rows}")
+            placeholder = st.empty()
             try:
-                resp = requests.post(
-                    "https://api.groq.com/openai/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {api_key}",
-                             "Content-Type": "application/json"},
-                    json={"model": "llama3-70b-8192",
-                          "messages": [{"role": "user", "content": prompt}],
-                          "temperature": 0.3, "max_tokens": 800},
-                    timeout=30,
-                )
-                if resp.status_code == 200:
-                    answer = resp.json()["choices"][0]["message"]["content"]
-                    code = None
-                    match = re.search(r"```python(.*?)```", answer, re.DOTALL)
-                    if match:
-                        code = match.group(1).strip()
-                        answer = answer.replace(match.group(0), "").strip()
+                answer, drawn = "", 0.0
+                for piece in chat_client(api_key).stream(prompt, data_key):
+                    answer += piece
+                    if time.monotonic() - drawn > 0.05:  # throttle redraws
+                        placeholder.markdown(answer + "▌")
+                        drawn = time.monotonic()
+                code = None
+                match = re.search(r"```python(.*?)```", answer, re.DOTALL)
+                if match:
+                    code = match.group(1).strip()
+                    answer = answer.replace(match.group(0), "").strip()
+                with placeholder.container():
                     st.markdown(answer)
                     if code:
                         st.caption("Suggested chart code (not executed):")
                         st.code(code, language="python")
-                else:
-                    st.error(f"Groq API error ({resp.status_code}).")
-            except Exception as e:
-                st.error(f"Request failed: {e}")
+            except chat.ChatError as e:
+                placeholder.error(f"Groq API error ({e.status}).")
+            except (requests.RequestException, ValueError) as e:
+                placeholder.error(f"Request failed: {e}")
 
 st.markdown("<div class='rule thin' style='margin-top:32px'></div>"
             "<div class='dateline' style='text-align:center'>DataLite · "
             "auto-insight EDA · every number verifiable</div>",
             unsafe_allow_html=True)
+
+if watch_path and stream is not None:
+    watch_for_growth(tail)
@@ -0,0 +1,242 @@
+"""
+DataLite — scaling benchmarks
+=============================
+
+Times and memory-profiles every detector, `analyze()` and
+`render.insights_html` on synthetic tables across a grid of sizes, and checks
+that the effects planted in those tables are still found, so a fast path
+can't quietly trade correctness for speed.
+
+    python bench.py --rows 10000,100000,1000000 --cols 12,48
+    python bench.py --compare bench-results/<old>.json
+    python bench.py --backends polars,duckdb
+
+Results land in ``bench-results/<git sha>.json``; ``--compare`` prints the
+ratio of every timing against an earlier file, and ``--backends`` checks that
+the other compute backends report exactly the findings pandas does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import insight_engine as ie
+import render
+
+RESULTS_DIR = Path("bench-results")
+
+
+# --------------------------------------------------------------------------- #
+# Synthetic tables with known effects
+# --------------------------------------------------------------------------- #
+def make_dataset(n_rows: int, n_cols: int = 12, card: int = 6,
+                 seed: int = 0) -> tuple[pd.DataFrame, list[dict]]:
+    """A noisy table of about `n_cols` columns with five planted effects.
+
+    Three quarters of the columns are numeric noise, the rest categorical
+    with `card` levels. Returns the frame and the effects, each a dict with
+    the finding ``kind`` and the ``evidence`` entries that identify it.
+    """
+    rng = np.random.default_rng(seed)
+    n_cat = max(2, n_cols // 4)
+    n_num = max(5, n_cols - n_cat)
+    levels = [f"L{i}" for i in range(card)]
+    df = pd.DataFrame({f"num{i}": rng.normal(size=n_rows) for i in range(n_num)})
+    for i in range(n_cat):
+        df[f"cat{i}"] = pd.Series(rng.choice(levels, size=n_rows))
+
+    # correlation: num1 follows num0 (r ~ 0.8)
+    df["num1"] = 0.8 * df["num0"] + 0.6 * df["num1"]
+    # segment difference: num2 is 1.5 sd higher in one level of cat0
+    df.loc[df["cat0"] == levels[0], "num2"] += 1.5
+    # missingness pattern: num3 goes missing far more often in one level of cat1
+    rate = np.where(df["cat1"] == levels[1], 0.6, 0.05)
+    df.loc[rng.random(n_rows) < rate, "num3"] = np.nan
+    # outliers: 4% of num4 sits far out
+    far = rng.random(n_rows) < 0.04
+    df.loc[far, "num4"] = rng.normal(25, 3, size=int(far.sum()))
+    # duplicates: 5% of rows repeated
+    dup = rng.choice(n_rows, size=n_rows // 20, replace=False)
+    df = pd.concat([df, df.iloc[dup]], ignore_index=True)
+    df = df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+    planted = [
+        {"kind": "correlation", "evidence": {"x": "num0", "y": "num1"}},
+        {"kind": "segment_difference",
+         "evidence": {"group_col": "cat0", "value_col": "num2"}},
+        {"kind": "missingness_pattern",
+         "evidence": {"missing_col": "num3", "group_col": "cat1"}},
+        {"kind": "outliers", "evidence": {"column": "num4"}},
+        {"kind": "duplicates", "evidence": {}},
+    ]
+    return df, planted
+
+
+def missed_effects(findings: list[ie.Finding], planted: list[dict]) -> list[str]:
+    """Kinds of the planted effects no finding matches."""
+    def hit(p, f):
+        if f.kind != p["kind"]:
+            return False
+        ev = f.evidence
+        if p["kind"] == "correlation":  # either order
+            return {ev.get("x"), ev.get("y")} == set(p["evidence"].values())
+        return all(ev.get(k) == v for k, v in p["evidence"].items())
+    return [p["kind"] for p in planted if not any(hit(p, f) for f in findings)]
+
+
+# --------------------------------------------------------------------------- #
+# Measurement
+# --------------------------------------------------------------------------- #
+def _cold():
+    ie.MEMO.clear()
+    render.CHART_CACHE.clear()
+
+
+def measure(fn, *args, **kwargs) -> tuple[object, dict]:
+    """Run `fn` with a cold memo; return its result, seconds and peak MB.
+
+    tracemalloc slows every allocation, so the time comes from a plain run
+    and the memory peak from a second, traced one.
+    """
+    _cold()
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    seconds = time.perf_counter() - t0
+    _cold()
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return out, {"seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)}
+
+
+def bench_case(n_rows: int, n_cols: int, card: int, seed: int = 0,
+               backends: tuple = ()) -> dict:
+    df, planted = make_dataset(n_rows, n_cols, card, seed)
+    case = {"rows": len(df), "cols": df.shape[1], "card": card, "timings": {}}
+    prof, case["timings"]["profile"] = measure(ie.DatasetProfile.from_frame, df)
+    for det in ie.DETECTORS:
+        _, case["timings"][det.__name__] = measure(det, df, profile=prof)
+    analysis, case["timings"]["analyze"] = measure(ie.run_analysis, df,
+                                                   limit=None)
+    _, case["timings"]["insights_html"] = measure(
+        render.insights_html, analysis.findings[:8], df)
+    case["missed"] = missed_effects(analysis.findings, planted)
+    case["dropped"] = [r.name for r in analysis.dropped]
+    if backends:
+        case["backend_diffs"] = {b: [list(f) for f in d] for b, d in
+                                 backend_parity(df, list(backends)).items()}
+    return case
+
+
+def backend_parity(df: pd.DataFrame, backends: list[str]) -> dict[str, list]:
+    """Findings that differ from the pandas backend's, per backend."""
+    def run(name):
+        ie.BACKEND = name
+        ie.MEMO.clear()
+        return [(f.kind, f.headline, round(f.score, 6), repr(f.evidence))
+                for f in ie.run_analysis(df, limit=None).findings]
+    saved = ie.BACKEND
+    try:
+        want = run("pandas")
+        diffs = {}
+        for name in backends:
+            got = run(name)
+            diffs[name] = ([g for g in got if g not in want]
+                           + [w for w in want if w not in got])
+        return diffs
+    finally:
+        ie.BACKEND = saved
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "nogit"
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print new/old time ratios for every case the two runs share."""
+    key = lambda c: (c["rows"], c["cols"], c["card"])
+    before = {key(c): c for c in old["cases"]}
+    for c in new["cases"]:
+        o = before.get(key(c))
+        if o is None:
+            continue
+        print(f"rows={c['rows']:,} cols={c['cols']} card={c['card']}")
+        for name, t in c["timings"].items():
+            if name in o["timings"]:
+                was = o["timings"][name]["seconds"]
+                ratio = t["seconds"] / was if was else float("nan")
+                print(f"  {name:<28} {was:8.3f}s -> {t['seconds']:8.3f}s"
+                      f"  x{ratio:.2f}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    ap.add_argument("--rows", default="10000,100000",
+                    help="comma-separated row counts")
+    ap.add_argument("--cols", default="12,48",
+                    help="comma-separated column counts")
+    ap.add_argument("--card", default="6", help="comma-separated cardinalities")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=None,
+                    help="results file (default bench-results/<sha>.json)")
+    ap.add_argument("--compare", default=None,
+                    help="earlier results file to compare against")
+    ap.add_argument("--backends", default="",
+                    help="comma-separated backends whose findings must match "
+                         "pandas' on every case (e.g. polars,duckdb)")
+    args = ap.parse_args(argv)
+    backends = [b for b in args.backends.split(",") if b]
+
+    grid = [(int(float(r)), int(c), int(k))
+            for r in args.rows.split(",") for c in args.cols.split(",")
+            for k in args.card.split(",")]
+    cases = []
+    for n_rows, n_cols, card in grid:
+        case = bench_case(n_rows, n_cols, card, args.seed, tuple(backends))
+        t = case["timings"]
+        diffs = {b: len(d) for b, d in case.get("backend_diffs", {}).items()
+                 if d}
+        print(f"rows={case['rows']:,} cols={case['cols']} card={card}: "
+              f"analyze {t['analyze']['seconds']:.2f}s "
+              f"(peak {t['analyze']['peak_mb']:.0f} MB), "
+              f"render {t['insights_html']['seconds']:.2f}s"
+              + (f"  MISSED {case['missed']}" if case["missed"] else "")
+              + (f"  BACKEND MISMATCH {diffs}" if diffs else ""),
+              flush=True)
+        cases.append(case)
+
+    result = {"commit": _git_sha(), "python": platform.python_version(),
+              "pandas": pd.__version__, "numpy": np.__version__,
+              "cases": cases}
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{result['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=1))
+    print(f"wrote {out}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), result)
+    # a planted effect going missing, or a backend disagreeing with pandas,
+    # is a correctness regression
+    return 1 if any(c["missed"] or any(c.get("backend_diffs", {}).values())
+                    for c in cases) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
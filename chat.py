@@ -0,0 +1,149 @@
+"""
+DataLite — chat client
+======================
+
+The optional "Ask a question" panel's connection to an OpenAI-compatible
+chat-completions API (Groq by default). One `ChatClient` keeps a pooled
+keep-alive session, streams answers token by token so the first words show
+up as soon as the model produces them, and remembers recent answers per
+(dataset fingerprint, prompt) so asking the same question again is instant.
+
+`base_url` can point anywhere that speaks the same protocol, e.g. a stub
+server on localhost. Kept free of Streamlit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+MODEL = "llama3-70b-8192"
+# seconds to connect / between streamed bytes
+TIMEOUT = (5, 30)
+POOL_SIZE = 4
+# answers are reused for this long, at most this many of them
+CACHE_TTL = 60 * 60
+CACHE_MAX_ENTRIES = 256
+
+
+class ChatError(Exception):
+    """The API answered with an error status."""
+
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(f"chat API error {status}: {message}".rstrip(": "))
+        self.status = status
+
+
+class _TTLCache:
+    """Thread-safe LRU whose entries also expire `ttl` seconds after being
+    stored."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class ChatClient:
+    """Streaming chat completions over one pooled session, with an answer
+    cache. Safe to share across Streamlit reruns and threads."""
+
+    def __init__(self, api_key: str, base_url: str = GROQ_URL,
+                 model: str = MODEL, ttl: float = CACHE_TTL,
+                 temperature: float = 0.3, max_tokens: int = 800):
+        self.base_url = base_url
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cache = _TTLCache(ttl, CACHE_MAX_ENTRIES)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {api_key}",
+                                     "Content-Type": "application/json"})
+
+    def _key(self, dataset: str, prompt: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (dataset, self.model, str(self.temperature), prompt):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def stream(self, prompt: str, dataset: str = "") -> Iterator[str]:
+        """Yield the answer to `prompt` in pieces as they arrive.
+
+        `dataset` is a fingerprint of the data the prompt describes; a
+        cached answer for the same (dataset, prompt) comes back as a single
+        piece. Only complete answers are cached.
+        """
+        key = self._key(dataset, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        body = {"model": self.model, "stream": True,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens}
+        parts, done = [], False
+        with self.session.post(self.base_url, json=body, stream=True,
+                               timeout=TIMEOUT) as resp:
+            if resp.status_code != 200:
+                raise ChatError(resp.status_code, resp.text[:200])
+            resp.encoding = "utf-8"
+            # server-sent events: "data: {json}" lines, then "data: [DONE]";
+            # reading on to the end hands the connection back to the pool
+            for line in resp.iter_lines(decode_unicode=True):
+                if done or not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    done = True
+                    continue
+                choice = json.loads(data)["choices"][0]
+                piece = (choice.get("delta") or {}).get("content")
+                if piece:
+                    parts.append(piece)
+                    yield piece
+        if done:  # a cut-off answer is not worth keeping
+            self.cache.put(key, "".join(parts))
+
+    def ask(self, prompt: str, dataset: str = "") -> str:
+        """The whole answer at once."""
+        return "".join(self.stream(prompt, dataset))
+
+    def close(self) -> None:
+        self.session.close()
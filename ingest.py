@@ -0,0 +1,288 @@
+"""
+DataLite — ingestion
+====================
+
+Turns uploads into memory-lean DataFrames: an Arrow-backed CSV parse when
+pyarrow is installed, integer columns downcast to the narrowest lossless
+width, and repetitive text stored as ``category``. The findings don't change;
+peak memory does, and the categorical detectors work on ready-made codes.
+
+CSV, Parquet and Arrow IPC/Feather are read. Each parsed upload is also
+written once to an uncompressed Arrow file keyed by its content hash; later
+reads memory-map that file instead of parsing again.
+
+Kept free of Streamlit so batch jobs can share it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:  # optional: the fast CSV parser, Parquet/Feather and the frame cache
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# text columns become categories when their distinct values are at most
+# this share of the non-null ones, and no more than this many
+CATEGORY_MAX_FRAC = 0.05
+CATEGORY_MAX_VALUES = 10_000
+
+# file extension -> reader
+FORMATS = {".csv": "csv", ".txt": "csv", ".parquet": "parquet",
+           ".pq": "parquet", ".feather": "feather", ".arrow": "feather",
+           ".ipc": "feather"}
+
+# parsed uploads, one Arrow file each; least recently read go first
+CACHE_DIR = Path(os.environ.get("DATALITE_CACHE_DIR",
+                                Path.home() / ".cache" / "datalite"))
+CACHE_MAX_BYTES = 20 * 1024**3
+# bump whenever `optimize_dtypes()` changes what it returns; cached frames
+# from another version (of this or of pandas/pyarrow) are parsed again
+INGEST_VERSION = 2
+_CACHE_META = b"datalite.ingest"
+_CACHE_VERSION = b"datalite.version"
+
+
+@dataclass
+class IngestReport:
+    """What ingestion did to a frame, for the "memory saved" caption."""
+
+    engine: str                      # reader: CSV parser, format or cache
+    bytes_before: int                # deep memory usage as parsed
+    bytes_after: int                 # ... after dtype optimization
+    changed: dict[str, tuple[str, str]] = field(default_factory=dict)
+    # column -> (old dtype, new dtype)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def read_csv(src, **kwargs) -> tuple[pd.DataFrame, IngestReport]:
+    """Parse a CSV path or file object and shrink its dtypes."""
+    engine = "pyarrow" if HAS_ARROW else "c"
+    try:
+        df = pd.read_csv(src, engine=engine, **kwargs)
+    except ValueError:
+        # the Arrow parser rejects some inputs/options the C one accepts
+        if engine == "c":
+            raise
+        if hasattr(src, "seek"):
+            src.seek(0)
+        engine = "c"
+        df = pd.read_csv(src, engine=engine, **kwargs)
+    return optimize_dtypes(df, engine=engine)
+
+
+def optimize_dtypes(df: pd.DataFrame, engine: str = ""
+                    ) -> tuple[pd.DataFrame, IngestReport]:
+    """Downcast integers and convert low-cardinality text to ``category``.
+
+    Floats are left at 64 bits: pandas accumulates float32 sums in float32,
+    which would shift means and effect sizes.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    lean, changed = {}, {}
+    for c in df.columns:
+        col = df[c]
+        s = _lean(col)
+        if s is not col:
+            lean[c] = s
+            changed[c] = (str(col.dtype), str(s.dtype))
+    if lean:
+        df = df.copy(deep=False)
+        for c, s in lean.items():
+            df[c] = s
+    after = int(df.memory_usage(deep=True).sum()) if lean else before
+    return df, IngestReport(engine, before, after, changed)
+
+
+def _lean(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    if pd.api.types.is_integer_dtype(s):
+        small = pd.to_numeric(s, downcast="integer")
+        return small if small.dtype.itemsize < s.dtype.itemsize else s
+    if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    count = int(s.count())
+    if count and s.nunique(dropna=True) <= min(CATEGORY_MAX_FRAC * count,
+                                               CATEGORY_MAX_VALUES):
+        try:
+            return s.astype("category")
+        except TypeError:  # mixed, unorderable labels
+            return s
+    return s
+
+
+# --------------------------------------------------------------------------- #
+# Other formats and the on-disk frame cache
+# --------------------------------------------------------------------------- #
+def file_format(name: str) -> str:
+    """"csv", "parquet" or "feather", from the file name."""
+    fmt = FORMATS.get(Path(name).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported file type: {name}")
+    return fmt
+
+
+def read_any(src, name: str) -> tuple[pd.DataFrame, IngestReport]:
+    """Read a CSV, Parquet or Feather upload and shrink its dtypes."""
+    fmt = file_format(name)
+    if fmt == "csv":
+        return read_csv(src)
+    if fmt == "parquet":
+        return optimize_dtypes(pd.read_parquet(src), engine="parquet")
+    return optimize_dtypes(pd.read_feather(src), engine="feather")
+
+
+def digest(src) -> str:
+    """Content hash of a path or seekable file object (rewound afterwards)."""
+    h = hashlib.blake2b(digest_size=16)
+    f = open(src, "rb") if isinstance(src, (str, Path)) else src
+    try:
+        for block in iter(lambda: f.read(8 * 1024**2), b""):
+            h.update(block)
+    finally:
+        if f is src:
+            src.seek(0)
+        else:
+            f.close()
+    return h.hexdigest()
+
+
+def read_cached(src, name: str, key: str = None
+                ) -> tuple[pd.DataFrame, IngestReport]:
+    """`read_any()` through the Arrow frame cache.
+
+    `key` is the upload's `digest()`, if the caller already has it. On a hit
+    the frame is rebuilt from a memory map: numeric columns without nulls
+    stay views of the mapped file, so reopening costs page faults rather
+    than a parse. Files written under another `INGEST_VERSION`, pandas or
+    pyarrow are parsed again. Without pyarrow this is plain `read_any()`.
+    """
+    if not HAS_ARROW:
+        return read_any(src, name)
+    path = CACHE_DIR / f"{key or digest(src)}.arrow"
+    if path.exists():
+        try:
+            return _read_cache(path)
+        except (OSError, pa.ArrowInvalid, KeyError, ValueError):
+            path.unlink(missing_ok=True)  # torn or foreign file: rebuild it
+    df, report = read_any(src, name)
+    try:
+        _write_cache(path, df, report)
+        _prune_cache()
+    except (OSError, pa.ArrowException):
+        pass  # an unwritable cache only costs the speed-up
+    return df, report
+
+
+def _cache_version() -> bytes:
+    return json.dumps([INGEST_VERSION, pd.__version__, pa.__version__,
+                       CATEGORY_MAX_FRAC, CATEGORY_MAX_VALUES]).encode()
+
+
+def _read_cache(path: Path) -> tuple[pd.DataFrame, IngestReport]:
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    stamp = table.schema.metadata or {}
+    if stamp.get(_CACHE_VERSION) != _cache_version():
+        raise ValueError(f"{path} was written by another version")
+    meta = json.loads(stamp[_CACHE_META])
+    df = table.to_pandas(split_blocks=True)
+    os.utime(path)  # recency for pruning
+    meta["changed"] = {c: tuple(d) for c, d in meta["changed"].items()}
+    return df, IngestReport(**{**meta, "engine": "arrow cache"})
+
+
+def _write_cache(path: Path, df: pd.DataFrame, report: IngestReport) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}),
+         _CACHE_META: json.dumps(asdict(report)).encode(),
+         _CACHE_VERSION: _cache_version()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)  # readers never see a half-written file
+    finally:
+        tmp.unlink(missing_ok=True)  # gone already unless the write failed
+
+
+def _prune_cache() -> None:
+    for p in CACHE_DIR.glob("*.tmp"):
+        # left by a writer that was killed; a live one finishes well within
+        if time.time() - p.stat().st_mtime > 3600:
+            p.unlink(missing_ok=True)
+    files = sorted(CACHE_DIR.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in files)
+    for p in files[:-1]:  # never the file just written
+        if total <= CACHE_MAX_BYTES:
+            break
+        total -= p.stat().st_size
+        p.unlink(missing_ok=True)
+
+
+# --------------------------------------------------------------------------- #
+# Growing files
+# --------------------------------------------------------------------------- #
+class CsvTail:
+    """Reads the rows appended to a growing CSV since the previous call.
+
+    Only complete lines are consumed; a half-written last line waits for the
+    next call. Rows are split at every newline, so quoted fields holding
+    line breaks are not supported. Pair it with
+    `insight_engine.StreamAnalyzer` to keep findings current without
+    rereading the whole file.
+    """
+
+    def __init__(self, path, **read_kwargs):
+        self.path = Path(path)
+        self.read_kwargs = read_kwargs
+        self.offset = 0          # bytes consumed, header included
+        self.header = b""
+
+    def read_new(self, max_bytes: Optional[int] = None
+                 ) -> Optional[pd.DataFrame]:
+        """The new rows as a frame, or None if no complete row arrived.
+
+        With `max_bytes`, about that much of the backlog is read (more if a
+        single line is longer); call again until None to catch up in
+        bounded memory.
+        """
+        size = self.path.stat().st_size
+        if size < self.offset:
+            raise ValueError(f"{self.path} shrank; it is not append-only")
+        if size == self.offset:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, max_bytes or size))
+            while b"\n" not in data and self.offset + len(data) < size:
+                # a line longer than max_bytes: read on to its end
+                data += f.read(max_bytes or size)
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return None
+        data, self.offset = data[:end], self.offset + end
+        if not self.header:
+            cut = data.find(b"\n") + 1
+            self.header, data = data[:cut], data[cut:]
+        if not data.strip():
+            # only the header or blank lines so far: go on to the rows
+            return self.read_new(max_bytes)
+        return pd.read_csv(BytesIO(self.header + data), **self.read_kwargs)
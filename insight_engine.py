@@ -13,16 +13,47 @@ cannot fabricate numbers because it never sees the raw data.
 A "detector" scans the dataframe and returns a list of `Finding`s. `analyze()`
 runs every detector, deduplicates, ranks by `score * weight`, and returns the
 most interesting findings first.
+
+Headless batch use: ``python -m insight_engine extracts/*.parquet > out.jsonl``
+(see `main()`).
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Optional
+import argparse
+import contextvars
+import copy
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Optional
 
 import numpy as np
 import pandas as pd
 
+try:  # optional multi-threaded engines for the grouped aggregations
+    import polars as pl
+except ImportError:
+    pl = None
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
 # --------------------------------------------------------------------------- #
 # Per-detector priority weights. Higher = surfaced earlier when scores tie.
 # These encode editorial judgement: "X group scores higher than Y" is more
@@ -33,6 +64,7 @@ WEIGHTS = {
     "correlation": 1.00,
     "missingness_pattern": 0.95,
     "duplicates": 0.65,
+    "near_duplicates": 0.60,
     "imbalance": 0.70,
     "outliers": 0.60,
     "missingness": 0.50,
@@ -63,12 +95,6 @@ class Finding:
 # --------------------------------------------------------------------------- #
 # Column-type helpers
 # --------------------------------------------------------------------------- #
-def _numeric_cols(df: pd.DataFrame) -> list[str]:
-    cols = df.select_dtypes(include=[np.number]).columns
-    # drop boolean columns that numpy counts as numeric
-    return [c for c in cols if not pd.api.types.is_bool_dtype(df[c])]
-
-
 def _is_categorical_like(s: pd.Series) -> bool:
     """True for string/object/category/bool columns; False for numeric & datetime.
 
@@ -85,84 +111,1120 @@ def _is_categorical_like(s: pd.Series) -> bool:
     return True
 
 
-def _categorical_cols(df: pd.DataFrame, max_card: int = 12) -> list[str]:
-    out = []
-    for c in df.columns:
-        s = df[c]
-        if _is_categorical_like(s):
-            nun = s.nunique(dropna=True)
-            if 2 <= nun <= max_card:
-                out.append(c)
-    return out
+# --------------------------------------------------------------------------- #
+# Memoization: statistics keyed by column content fingerprints
+# --------------------------------------------------------------------------- #
+# Streamlit reruns the whole script on every widget click. Everything the
+# detectors compute is cached here under the fingerprints of the columns it
+# was computed from, so an unchanged frame is answered from memory and an
+# edited column only re-runs the statistics that involve it.
+MEMO_BYTES = 512 * 1024**2
+# batch workers (`main()`) never see a file twice; they keep just enough to
+# share statistics between the detectors of the file in hand
+BATCH_MEMO_BYTES = 64 * 1024**2
+# correlations are memoized per column (one entry of p coefficients each) up
+# to this many columns; wider tables keep the whole matrix as one entry and
+# recompute it when any column changes
+CORR_MEMO_MAX_COLS = 512
+
+
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+_TYPE_MIX = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def _column_hashes(s: pd.Series) -> np.ndarray:
+    """One 64-bit hash per value (NaNs hash alike, as do 0.0 and -0.0)."""
+    return _hash_column(s)[0]
+
+
+def _hash_column(s: pd.Series) -> tuple[np.ndarray, Optional[tuple]]:
+    """`_column_hashes(s)`, plus ``(codes, uniques)`` for text columns that
+    were factorized on the way (None otherwise)."""
+    if _is_categorical_like(s) and not pd.api.types.is_bool_dtype(s):
+        if not _mostly_distinct(s):
+            # hash each distinct label once; far cheaper on repetitive text
+            codes, uniques = pd.factorize(s)
+            hashed = _hash_labels(np.asarray(uniques, dtype=object))
+            return np.where(codes >= 0, hashed[codes], _NULL_HASH), (codes, uniques)
+        # IDs, free text: a hash table of every label would not pay for itself
+        hashed = _hash_labels(np.asarray(s, dtype=object))
+        hashed[s.isna().to_numpy()] = _NULL_HASH
+        return hashed, None
+    if pd.api.types.is_float_dtype(s) and isinstance(s.dtype, np.dtype):
+        s = s + 0.0  # -0.0 + 0.0 == +0.0
+    return pd.util.hash_pandas_object(s, index=False).to_numpy(), None
+
+
+def _hash_labels(values: np.ndarray) -> np.ndarray:
+    """hash_array of object `values`, which hashes their text; a mix of
+    types also folds in each value's type, so 1 and "1" differ."""
+    hashed = pd.util.hash_array(values, categorize=False)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        types = np.array([type(v).__name__ for v in values], dtype=object)
+        hashed ^= pd.util.hash_array(types, categorize=True) * _TYPE_MIX
+    return hashed
+
+
+def _fingerprint(dtype, hashes: np.ndarray) -> str:
+    h = hashlib.blake2b(str(dtype).encode(), digest_size=16)
+    h.update(hashes.tobytes())
+    return h.hexdigest()
+
+
+def column_fingerprint(s: pd.Series) -> str:
+    """Content hash of a column: its dtype and every value, in order."""
+    return _fingerprint(s.dtype, _column_hashes(s))
+
+
+def _row_weight(i: int) -> np.uint64:
+    """Odd 64-bit multiplier for the column at position `i` (splitmix64)."""
+    m = (1 << 64) - 1
+    z = (i + 0x9E3779B97F4A7C15) & m
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & m
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & m
+    return np.uint64((z ^ (z >> 31)) | 1)
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) + 64 for v in value.values())
+    if isinstance(value, ColumnProfile):
+        return 256 + (value.codes.nbytes if value.codes is not None else 0)
+    return 256
+
+
+class _Memo:
+    """Thread-safe LRU cache bounded by the approximate bytes it holds."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            self._data.move_to_end(key)
+            return hit[0]
+
+    def put(self, key, value) -> None:
+        size = _nbytes(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                self._bytes -= self._data.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+MEMO = _Memo(MEMO_BYTES)
+
+
+# --------------------------------------------------------------------------- #
+# Quantile sketches
+# --------------------------------------------------------------------------- #
+# How `DatasetProfile.quartiles` works: "exact" quantiles per column, or
+# "sketch", one `QuantileSketch` per numeric column filled in a single pass.
+# Streams always fall back to sketches once exact value tables get too big.
+QUANTILE_MODE = "exact"
+SKETCH_K = 2048
+BOX_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _lerp_quantile(values: np.ndarray, cum: np.ndarray, q: float) -> float:
+    """numpy/pandas "linear" quantile of a sorted value → cumulative-count
+    table, without expanding it back into rows."""
+    h = (cum[-1] - 1) * q
+    i = int(np.floor(h))
+    t = h - i
+    a = values[np.searchsorted(cum, i, side="right")]
+    b = values[np.searchsorted(cum, min(i + 1, cum[-1] - 1), side="right")]
+    # same two-sided lerp numpy uses, so results match bit for bit
+    return float(b - (b - a) * (1 - t)) if t >= 0.5 else float(a + (b - a) * t)
+
+
+class QuantileSketch:
+    """Mergeable quantile summary with bounded rank error (KLL-style).
+
+    Level h holds sorted values that stand for 2**h inputs each. A level
+    that outgrows `k` values is compacted: every other value, from a random
+    start, moves up a level. Ranks are off by about n/k at most and memory
+    is O(k·log(n/k)). Up to `k` values everything stays exact, and so do
+    the quantiles.
+    """
+
+    def __init__(self, k: int = SKETCH_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels: list[np.ndarray] = []
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values) -> None:
+        """Add a batch of values; NaNs are skipped."""
+        v = np.asarray(values, dtype=float)
+        v = np.sort(v[~np.isnan(v)])
+        if len(v):
+            self.n += len(v)
+            self._add(0, v)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.n += other.n
+        for h, v in enumerate(other.levels):
+            if len(v):
+                self._add(h, v)
+
+    def _add(self, h: int, v: np.ndarray) -> None:
+        while True:
+            if h == len(self.levels):
+                self.levels.append(v[:0])
+            if len(self.levels[h]):
+                v = np.sort(np.concatenate([self.levels[h], v]))
+            if len(v) <= self.k:
+                self.levels[h] = v
+                return
+            cut = len(v) - len(v) % 2
+            self.levels[h] = v[cut:]
+            v = v[self._rng.integers(2):cut:2]
+            h += 1
+
+    def _table(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 1 << h, dtype=np.int64)
+                                  for h, v in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantiles(self, qs) -> Optional[list[float]]:
+        """Linear-interpolation quantiles at `qs`, or None if empty."""
+        if not self.n:
+            return None
+        values, weights = self._table()
+        cum = np.cumsum(weights)
+        return [_lerp_quantile(values, cum, q) for q in qs]
+
+    @staticmethod
+    def error_bound(n: int, k: int = SKETCH_K) -> float:
+        """Rank error of a sketch of `n` values, as a fraction of `n`."""
+        return 0.0 if n <= k else 1 / k
+
+    @property
+    def rank_error(self) -> float:
+        return self.error_bound(self.n, self.k)
+
+    def count_outside(self, lo: float, hi: float) -> int:
+        if not self.n:
+            return 0
+        values, weights = self._table()
+        return int(weights[(values < lo) | (values > hi)].sum())
+
+
+# --------------------------------------------------------------------------- #
+# Dataset profile: one pass over every column, shared by all detectors
+# --------------------------------------------------------------------------- #
+# categorical columns up to this many distinct values keep their factorized
+# codes; the detectors that group by a column never look past 12 groups.
+CODES_MAX_CARD = 255
+# Distinct counts. A column with more than CODES_MAX_CARD distinct values in
+# its first CARD_PROBE_ROWS rows only needs "how many, roughly" — nothing
+# groups by it — so it gets an estimate from the value hashes instead of a
+# hash table. Estimates above CARD_EXACT_FRAC of the rows are settled with an
+# exact uniqueness check, which the identifier rule in `detect_hygiene` needs.
+CARD_PROBE_ROWS = 20_000
+CARD_EXACT_FRAC = 0.9
+CARD_SKETCH_K = 1024    # relative error about 1/sqrt(k)
+
+
+@dataclass
+class ColumnProfile:
+    """Per-column facts gathered once and reused by every detector."""
+
+    name: str
+    kind: str                       # "numeric" | "categorical" | "datetime"
+    count: int                      # non-null values
+    n_null: int
+    n_unique: int                   # distinct non-null values
+    n_unique_is_bound: bool = False  # n_unique is a bound or an estimate
+    is_float: bool = False
+    mean: float = float("nan")      # numeric only
+    std: float = float("nan")       # numeric only, ddof=1
+    codes: Optional[np.ndarray] = None  # factorized, -1 = missing
+    uniques: Optional[pd.Index] = None  # labels for `codes`, sorted
+
+    @property
+    def null_frac(self) -> float:
+        total = self.count + self.n_null
+        return self.n_null / total if total else 0.0
+
+
+@dataclass
+class DatasetProfile:
+    """Everything the detectors need to know about a frame, computed once.
+
+    Build it with `DatasetProfile.from_frame(df)` and hand it to `analyze()`,
+    `dataset_summary()` or any `detect_*` function; each of them builds its
+    own when none is passed.
+    """
+
+    n_rows: int
+    columns: dict[str, ColumnProfile]
+    n_duplicates: int
+    frame: Optional[pd.DataFrame] = field(default=None, repr=False,
+                                          compare=False)
+    fingerprints: dict[str, str] = field(default_factory=dict, repr=False)
+    # 64-bit hash of every row: the sum of its column value hashes, each
+    # times the column's `_row_weight`, so a column's term can be taken out
+    row_hash: Optional[np.ndarray] = field(default=None, repr=False,
+                                           compare=False)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DatasetProfile":
+        # the fingerprinting pass hashes every value once; the same hashes
+        # make the row hashes that duplicate detection works from
+        fps, cols = {}, {}
+        row_hash = np.zeros(len(df), dtype=np.uint64)
+        for i, c in enumerate(df.columns):
+            h, factorized = _hash_column(df[c])
+            fps[c] = _fingerprint(df[c].dtype, h)
+            row_hash += h * _row_weight(i)
+            prof = MEMO.get(("column", fps[c]))
+            if prof is None:
+                prof = _profile_column(c, df[c], h, factorized)
+                MEMO.put(("column", fps[c]), prof)
+            cols[c] = replace(prof, name=c)
+        key = ("duplicates", tuple(fps.values()))
+        dups = MEMO.get(key)
+        if dups is None:
+            dups = int(len(df) - len(pd.unique(row_hash)))
+            MEMO.put(key, dups)
+        return cls(n_rows=int(len(df)), columns=cols, n_duplicates=dups,
+                   frame=df, fingerprints=fps, row_hash=row_hash)
+
+    @property
+    def n_cols(self) -> int:
+        return len(self.columns)
+
+    @property
+    def numeric(self) -> list[str]:
+        return [c for c, p in self.columns.items() if p.kind == "numeric"]
+
+    def categorical(self, max_card: int = 12) -> list[str]:
+        """Categorical-like columns with between 2 and `max_card` values."""
+        return [c for c, p in self.columns.items()
+                if p.kind == "categorical" and 2 <= p.n_unique <= max_card]
+
+    def value_counts(self, col: str) -> pd.Series:
+        """Like ``df[col].value_counts()``, read off the factorized codes."""
+        p = self.columns[col]
+        codes = p.codes[p.codes >= 0]
+        counts = np.bincount(codes, minlength=len(p.uniques))
+        vc = pd.Series(counts, index=p.uniques, name="count")
+        # ties keep first-appearance order, as value_counts does
+        first = pd.unique(codes)
+        return vc.iloc[first].sort_values(ascending=False, kind="stable")
+
+    # The statistics below are what the detectors actually consume. They are
+    # computed from `frame` on demand and memoized per column or column pair;
+    # `StreamProfile` serves the same ones from statistics merged chunk by
+    # chunk.
+
+    def _subset_hash(self, exclude) -> np.ndarray:
+        h = self.row_hash
+        if exclude:
+            h = h.copy()
+            pos = {c: i for i, c in enumerate(self.columns)}
+            for c in exclude:
+                h -= _column_hashes(self.frame[c]) * _row_weight(pos[c])
+        return h
+
+    def duplicate_stats(self, exclude: tuple = ()
+                        ) -> Optional[tuple[int, int, int]]:
+        """(duplicate rows, clusters, largest cluster) comparing rows on
+        every column except `exclude`, or None without row hashes.
+
+        Rows are compared by their 64-bit hashes, so this is one factorize
+        and never a pairwise comparison.
+        """
+        if self.row_hash is None:
+            return None
+        exclude = tuple(exclude)
+
+        def compute():
+            codes, uniques = pd.factorize(self._subset_hash(exclude))
+            sizes = np.bincount(codes)
+            repeated = sizes[sizes > 1]
+            return (int(len(codes) - len(uniques)), int(len(repeated)),
+                    int(repeated.max()) if len(repeated) else 0)
+        return self._memo(("dup_stats", tuple(self.fingerprints.values()),
+                           exclude), compute)
+
+    def duplicate_clusters(self, exclude: tuple = ()) -> pd.Series:
+        """Cluster number of every row that repeats another, indexed like
+        the frame; rows in the same cluster match on all columns but
+        `exclude`."""
+        codes, _ = pd.factorize(self._subset_hash(tuple(exclude)))
+        repeated = np.bincount(codes)[codes] > 1
+        cluster, _ = pd.factorize(codes[repeated])
+        return pd.Series(cluster, index=self.frame.index[repeated],
+                         name="cluster")
+
+    def _memo_pairs(self, tag: str, rows: list[str], cols: list[str],
+                    compute) -> dict:
+        """``{(r, c): value}`` for every pair, memoized by fingerprints.
+
+        Each row column keeps one memo entry, mapping the fingerprints of
+        the columns it was paired with to the values. `compute(rows, cols)`
+        returns the same kind of table and is only run over the rows and
+        columns that take part in a cache miss.
+        """
+        fp = self.fingerprints
+        if not fp:
+            return compute(rows, cols)
+        out, blocks, miss_rows, miss_cols = {}, {}, [], set()
+        for r in rows:
+            block = blocks[r] = MEMO.get((tag, fp[r])) or {}
+            missing = [c for c in cols if fp[c] not in block]
+            if missing:
+                miss_rows.append(r)
+                miss_cols.update(missing)
+            for c in cols:
+                if fp[c] in block:
+                    out[(r, c)] = block[fp[c]]
+        if not miss_rows:
+            return out
+        fresh = compute(miss_rows, [c for c in cols if c in miss_cols])
+        for r in miss_rows:
+            block = dict(blocks[r])
+            for c in cols:
+                if (r, c) in fresh:
+                    out[(r, c)] = block[fp[c]] = fresh[(r, c)]
+            MEMO.put((tag, fp[r]), block)
+        return out
+
+    def _memo(self, key: tuple, compute):
+        if not self.fingerprints:
+            return compute()
+        hit = MEMO.get(key)
+        if hit is None:
+            hit = compute()
+            MEMO.put(key, hit)
+        return hit
+
+    def group_moments(self, cats: list[str], cols: list[str]
+                      ) -> tuple[dict[str, tuple], np.ndarray]:
+        """Per-group count, sum and sum of squares of `cols` for every `cats`.
+
+        Values are shifted by the column means before squaring so variances
+        recovered from the sums keep their precision. Returns
+        ``({cat: (count, sum, sumsq)}, shift)``, each array
+        ``groups × len(cols)`` with groups in `uniques` order.
+        """
+        pairs = self._memo_pairs("moments", cats, cols, self._group_moments)
+        out = {c: tuple(np.column_stack([pairs[(c, n)][k] for n in cols])
+                        for k in range(3))
+               for c in cats}
+        return out, self._shift(cols)
+
+    def _shift(self, cols: list[str]) -> np.ndarray:
+        return np.array([np.nan_to_num(self.columns[n].mean) for n in cols])
 
+    def _group_moments(self, cats, cols) -> dict:
+        shift = self._shift(cols)
+        if BACKEND != "pandas":
+            cnt, s1, s2 = _engine_group_sums(
+                self, cats, lambda n: self.frame[n].to_numpy(
+                    dtype=float, na_value=np.nan), cols, shift)
+        else:
+            total = sum(self.columns[c].n_unique for c in cats)
+            cnt = np.zeros((total, len(cols)))
+            s1, s2 = np.zeros_like(cnt), np.zeros_like(cnt)
+            for start in range(0, self.n_rows, ROW_BLOCK):
+                rows = slice(start, start + ROW_BLOCK)
+                onehot, _ = _onehot_block(self, cats, rows)
+                x = _float_block(self.frame, cols, rows, shift)
+                ok = ~np.isnan(x)
+                x[~ok] = 0.0
+                cnt += onehot.T @ ok
+                s1 += onehot.T @ x
+                s2 += onehot.T @ (x * x)
+        out = {}
+        offsets = np.cumsum([0] + [self.columns[c].n_unique for c in cats])
+        for c, off in zip(cats, offsets):
+            g = slice(off, off + self.columns[c].n_unique)
+            for j, n in enumerate(cols):
+                out[(c, n)] = (cnt[g, j], s1[g, j], s2[g, j])
+        return out
 
-def _cohen_d(a: pd.Series, b: pd.Series) -> float:
-    a, b = a.dropna(), b.dropna()
-    n1, n2 = len(a), len(b)
+    def group_null_counts(self, cats: list[str], cols: list[str]
+                          ) -> tuple[np.ndarray, np.ndarray]:
+        """Group sizes of `cats` (stacked side by side) and per-group null
+        counts of `cols`, ``groups × len(cols)``."""
+        pairs = self._memo_pairs("nulls", cats, cols, self._group_null_counts)
+        sizes = np.concatenate([pairs[(c, cols[0])][0] for c in cats])
+        nulls = np.vstack([np.column_stack([pairs[(c, m)][1] for m in cols])
+                           for c in cats])
+        return sizes, nulls
+
+    def _group_null_counts(self, cats, cols) -> dict:
+        if BACKEND != "pandas":
+            # every row counts towards a null indicator's group size
+            cnt, nulls, _ = _engine_group_sums(
+                self, cats, lambda m: self.frame[m].isna().to_numpy(), cols,
+                np.zeros(len(cols)))
+            sizes = cnt[:, 0]
+        else:
+            total = sum(self.columns[c].n_unique for c in cats)
+            sizes = np.zeros(total)
+            nulls = np.zeros((total, len(cols)))
+            for start in range(0, self.n_rows, ROW_BLOCK):
+                rows = slice(start, start + ROW_BLOCK)
+                onehot, _ = _onehot_block(self, cats, rows)
+                ind = self.frame[cols].iloc[rows].isna().to_numpy(dtype=float)
+                sizes += onehot.sum(axis=0)
+                nulls += onehot.T @ ind
+        out, offsets = {}, np.cumsum([0] + [self.columns[c].n_unique
+                                            for c in cats])
+        for c, off, end in zip(cats, offsets, offsets[1:]):
+            for j, m in enumerate(cols):
+                out[(c, m)] = (sizes[off:end], nulls[off:end, j])
+        return out
+
+    def corr(self, cols: list[str], method: str = "pearson") -> pd.DataFrame:
+        """Pairwise-complete correlation matrix of `cols`."""
+        return self.corr_counts(cols, method)[0]
+
+    def corr_counts(self, cols: list[str], method: str = "pearson"
+                    ) -> tuple[pd.DataFrame, np.ndarray]:
+        """`corr()` and the number of rows behind each coefficient.
+
+        `method` is "pearson" or "spearman". Spearman ranks each column once
+        over all of its values; where values are missing that differs
+        slightly from pandas, which re-ranks every pair's complete rows.
+        """
+        if method not in ("pearson", "spearman"):
+            raise ValueError(f"unknown correlation method {method!r}")
+        fp = self.fingerprints
+        if not fp or len(cols) > CORR_MEMO_MAX_COLS:
+            key = ("corr_matrix", method) + tuple(fp.get(c) for c in cols)
+            r, n = self._memo(key, lambda: self._pearson(cols, cols, method))
+            return pd.DataFrame(r, index=cols, columns=cols), n
+        # one memo entry per column: its coefficients and counts against the
+        # columns it was computed with, looked up by (the first 64 bits of)
+        # their fingerprints
+        fps = np.array([int(fp[c][:16], 16) for c in cols], dtype=np.uint64)
+        p = len(cols)
+        r, n = np.full((p, p), np.nan), np.zeros((p, p))
+        known = np.zeros((p, p), dtype=bool)
+        for i, c in enumerate(cols):
+            block = MEMO.get(("corr", method, fp[c]))
+            if block is None:
+                continue
+            partners, br, bn = block
+            at = np.minimum(np.searchsorted(partners, fps), len(partners) - 1)
+            hit = partners[at] == fps
+            r[i, hit], n[i, hit], known[i, hit] = br[at[hit]], bn[at[hit]], True
+        # a pair is known if either of its columns has it
+        r = np.where(known, r, r.T)
+        n = np.where(known, n, n.T)
+        known |= known.T
+        stale = np.flatnonzero(~known.all(axis=1))
+        if len(stale):
+            if 2 * len(stale) > p:  # mostly cold: one full matrix
+                stale = np.arange(p)
+            rows = [cols[i] for i in stale]
+            fr, fn = self._pearson(rows, cols, method)
+            r[stale, :], n[stale, :] = fr, fn
+            r[:, stale], n[:, stale] = fr.T, fn.T
+            order = np.argsort(fps)
+            partners = fps[order]
+            for k, i in enumerate(stale):
+                MEMO.put(("corr", method, fp[cols[i]]),
+                         (partners, fr[k, order], fn[k, order]))
+        return pd.DataFrame(r, index=cols, columns=cols), n
+
+    def _pearson(self, rows, cols, method) -> tuple[np.ndarray, np.ndarray]:
+        """Pearson r of `rows` × `cols` and pair counts, from co-moments
+        accumulated as matrix products over row blocks (as the stream does),
+        so the cost is a few BLAS calls rather than a loop over pairs."""
+        frame = self.frame
+        if method == "spearman":
+            frame = frame[list(dict.fromkeys(rows + cols))].rank()
+            shift = lambda cs: np.array([(self.columns[c].count + 1) / 2
+                                         for c in cs])
+        else:
+            shift = self._shift
+        same = rows == cols
+        complete = all(self.columns[c].n_null == 0 for c in set(rows + cols))
+        p, q = len(rows), len(cols)
+        n = np.zeros((p, q))
+        sa, saa, sb, sbb, sab = (np.zeros((p, q)) for _ in range(5))
+        for start in range(0, self.n_rows, ROW_BLOCK):
+            block = slice(start, start + ROW_BLOCK)
+            y = _float_block(frame, cols, block, shift(cols))
+            x = y if same else _float_block(frame, rows, block, shift(rows))
+            if complete:
+                n += len(y)
+                sa += x.sum(axis=0)[:, None]
+                saa += (x * x).sum(axis=0)[:, None]
+                sb += y.sum(axis=0)
+                sbb += (y * y).sum(axis=0)
+                sab += x.T @ y
+                continue
+            ok_y = ~np.isnan(y)
+            ok_x = ok_y if same else ~np.isnan(x)
+            y[~ok_y] = 0.0
+            x[~ok_x] = 0.0
+            ok_x, ok_y = ok_x.astype(float), ok_y.astype(float)
+            n += ok_x.T @ ok_y
+            sab += x.T @ y
+            sa += x.T @ ok_y
+            saa += (x * x).T @ ok_y
+            sb += ok_x.T @ y
+            sbb += ok_x.T @ (y * y)
+        return _corr_from_moments(n, sa, saa, sb, sbb, sab), n
+
+    def pair_count(self, a: str, b: str) -> int:
+        """Rows where both `a` and `b` are present."""
+        fp = self.fingerprints
+        return self._memo(("pair_n",) + tuple(sorted((fp.get(a), fp.get(b)))),
+                          lambda: int(self.frame[[a, b]].dropna().shape[0]))
+
+    def value_range(self, col: str) -> Optional[tuple[float, float]]:
+        """(min, max) of a numeric column; None without values."""
+        def compute():
+            s = self.frame[col]
+            return (float(s.min()), float(s.max())) if s.count() else ()
+        return self._memo(("range", self.fingerprints.get(col)), compute) \
+            or None
+
+    def quartiles(self, cols: list[str]
+                  ) -> dict[str, Optional[tuple[float, float, float]]]:
+        """(Q1, median, Q3) of each of `cols`, linear interpolation; None
+        for a column without values. Sketched rather than exact under
+        ``QUANTILE_MODE = "sketch"``."""
+        fp = self.fingerprints
+        key = lambda c: ("quartiles", QUANTILE_MODE, fp[c])
+        out, miss = {}, []
+        for c in cols:
+            hit = MEMO.get(key(c)) if fp else None
+            if hit is None:
+                miss.append(c)
+            else:
+                out[c] = hit
+        if miss:
+            for c, q in self._quartiles(miss).items():
+                if fp:
+                    MEMO.put(key(c), q)
+                out[c] = q
+        return {c: out[c] or None for c in cols}
+
+    def quartile_error(self, col: str) -> float:
+        """Rank error of `quartiles()` for `col` as a fraction of its
+        values; 0.0 when they are exact."""
+        if QUANTILE_MODE == "exact":
+            return 0.0
+        return QuantileSketch.error_bound(self.columns[col].count)
+
+    def _quartiles(self, cols: list[str]) -> dict:
+        # () rather than None for "no values", so the memo can store it
+        if QUANTILE_MODE == "exact":
+            out = {}
+            for c in cols:
+                q = self.frame[c].quantile(list(BOX_QUANTILES))
+                out[c] = () if q.isna().any() else tuple(map(float, q))
+            return out
+        # one pass over row blocks feeds every column's sketch
+        sketches = {c: QuantileSketch() for c in cols}
+        for start in range(0, self.n_rows, ROW_BLOCK):
+            x = _float_block(self.frame, cols, slice(start, start + ROW_BLOCK))
+            for j, c in enumerate(cols):
+                sketches[c].update(x[:, j])
+        return {c: tuple(sk.quantiles(BOX_QUANTILES) or ())
+                for c, sk in sketches.items()}
+
+    def count_outside(self, col: str, lo: float, hi: float) -> int:
+        def compute():
+            s = self.frame[col]
+            return int(((s < lo) | (s > hi)).sum())
+        return self._memo(("outside", self.fingerprints.get(col), lo, hi),
+                          compute)
+
+
+def _profile_column(name, s: pd.Series, hashes: Optional[np.ndarray] = None,
+                    factorized: Optional[tuple] = None) -> ColumnProfile:
+    """Profile one column; `hashes` and `factorized` are what
+    `_hash_column(s)` returned, if the caller has them."""
+    count = int(s.count())
+    n_null = int(len(s) - count)
+    if _is_categorical_like(s):
+        if factorized is None and not _mostly_distinct(s):
+            factorized = pd.factorize(s)
+        if factorized is None:
+            nun, bound = _count_distinct(s, hashes, count)
+            return ColumnProfile(name, "categorical", count, n_null, nun, bound)
+        codes, uniques = factorized
+        prof = ColumnProfile(name, "categorical", count, n_null, len(uniques))
+        if len(uniques) <= CODES_MAX_CARD:
+            codes, uniques = _sort_codes(codes, uniques)
+            dtype = np.int8 if len(uniques) < 127 else np.int16
+            prof.codes = codes.astype(dtype)
+            prof.uniques = pd.Index(uniques)
+        return prof
+    if _mostly_distinct(s):
+        nun, bound = _count_distinct(s, hashes, count)
+    else:
+        nun, bound = int(s.nunique(dropna=True)), False
+    if not pd.api.types.is_numeric_dtype(s):
+        return ColumnProfile(name, "datetime", count, n_null, nun, bound)
+    return ColumnProfile(name, "numeric", count, n_null, nun, bound,
+                         is_float=pd.api.types.is_float_dtype(s),
+                         mean=float(s.mean()) if count else float("nan"),
+                         std=float(s.std(ddof=1)) if count > 1 else float("nan"))
+
+
+def _sort_codes(codes: np.ndarray, uniques) -> tuple[np.ndarray, object]:
+    """Relabel a factorization so `uniques` is sorted, as ``sort=True``
+    would have; mixed, unorderable labels keep first-seen order."""
+    try:
+        order = uniques.argsort()
+    except TypeError:
+        return codes, uniques
+    rank = np.empty(len(order), dtype=codes.dtype)
+    rank[order] = np.arange(len(order))
+    return np.where(codes >= 0, rank[codes], -1), uniques[order]
+
+
+def _mostly_distinct(s: pd.Series) -> bool:
+    """More than CODES_MAX_CARD distinct values among the first rows."""
+    if isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(s):
+        return False  # already factorized / at most two values
+    return len(pd.unique(s.iloc[:CARD_PROBE_ROWS])) > CODES_MAX_CARD
+
+
+def _count_distinct(s: pd.Series, hashes: Optional[np.ndarray],
+                    count: int) -> tuple[int, bool]:
+    """(distinct non-null values, whether that is only an estimate) for a
+    column `_mostly_distinct()` has already ruled out as a grouping key."""
+    if hashes is None:
+        hashes = _column_hashes(s)
+    est = _estimate_distinct(hashes) - (count < len(s))  # minus the null hash
+    if (count == len(s) and est >= CARD_EXACT_FRAC * count
+            and not pd.api.types.is_float_dtype(s)):
+        if s.is_unique:  # a candidate identifier: settle it exactly
+            return count, False
+    return int(min(max(est, CODES_MAX_CARD + 1), count)), True
+
+
+def _estimate_distinct(hashes: np.ndarray, k: int = CARD_SKETCH_K) -> float:
+    """K-minimum-values estimate of the number of distinct 64-bit hashes."""
+    m = min(len(hashes), 16 * k)
+    if m == 0:
+        return 0.0
+    low = np.unique(np.partition(hashes, m - 1)[:m])
+    if len(low) < k:
+        # the smallest values repeat heavily; few distinct values overall
+        return float(len(pd.unique(hashes)))
+    return (k - 1) / (float(low[k - 1]) / 2.0**64)
+
+
+def _profile(df: pd.DataFrame,
+             profile: Optional[DatasetProfile]) -> DatasetProfile:
+    return profile if profile is not None else DatasetProfile.from_frame(df)
+
+
+# Detectors report how much they looked at through `_note()`; the counts
+# land in the detector's `DetectorRun` and are dropped when nobody listens.
+_probe: contextvars.ContextVar = contextvars.ContextVar("probe", default=None)
+
+
+def _note(rows: int, cols: int, candidates: int) -> None:
+    probe = _probe.get()
+    if probe is not None:
+        probe.update(rows=rows, cols=cols, candidates=candidates)
+
+
+# --------------------------------------------------------------------------- #
+# Grouped aggregation: one matrix product per row block for all groupings
+# --------------------------------------------------------------------------- #
+# rows per block; bounds the float copies made of the value columns
+ROW_BLOCK = 1 << 16
+
+
+def _float_block(df: pd.DataFrame, cols: list[str], rows: slice,
+                 shift: Optional[np.ndarray] = None) -> np.ndarray:
+    x = df[cols].iloc[rows].to_numpy(dtype=float, na_value=np.nan)
+    return x - shift if shift is not None else x
+
+
+def _corr_from_moments(n, sa, saa, sb, sbb, sab) -> np.ndarray:
+    """Pearson r from pairwise co-moments: over the rows where both a and b
+    are present, their count `n` and the sums of a, a², b, b² and a·b."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sab - sa * sb / n
+        va = saa - sa * sa / n
+        vb = sbb - sb * sb / n
+        # variances that are pure rounding noise mean a constant column
+        va[va <= 1e-10 * saa] = 0.0
+        vb[vb <= 1e-10 * sbb] = 0.0
+        r = cov / np.sqrt(va * vb)
+    r[(n < 2) | (va * vb == 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _onehot_block(prof: DatasetProfile, cats: list[str],
+                  rows) -> tuple[np.ndarray, list[int]]:
+    """Side-by-side one-hot encoding of `cats`; missing labels are all-zero."""
+    offsets, total = [], 0
+    for c in cats:
+        offsets.append(total)
+        total += prof.columns[c].n_unique
+    n = len(rows) if isinstance(rows, np.ndarray) else len(range(prof.n_rows)[rows])
+    onehot = np.zeros((n, total))
+    idx = np.arange(n)
+    for c, off in zip(cats, offsets):
+        codes = prof.columns[c].codes[rows]
+        ok = codes >= 0
+        onehot[idx[ok], off + codes[ok].astype(np.intp)] = 1.0
+    return onehot, offsets
+
+
+def _cohen_d(n1, sum1, sq1, n2, sum2, sq2) -> float:
+    """Cohen's d between two groups given their (shifted) count/sum/sumsq."""
     if n1 < 2 or n2 < 2:
         return 0.0
-    s1, s2 = a.std(ddof=1), b.std(ddof=1)
-    pooled = np.sqrt(((n1 - 1) * s1**2 + (n2 - 1) * s2**2) / (n1 + n2 - 2))
+    ss1 = sq1 - sum1 * sum1 / n1
+    ss2 = sq2 - sum2 * sum2 / n2
+    # sums of squares that are pure rounding noise mean a constant group
+    ss1 = 0.0 if ss1 <= 1e-10 * sq1 else ss1
+    ss2 = 0.0 if ss2 <= 1e-10 * sq2 else ss2
+    pooled = np.sqrt((ss1 + ss2) / (n1 + n2 - 2))
     if pooled == 0 or np.isnan(pooled):
         return 0.0
-    return float((a.mean() - b.mean()) / pooled)
+    return float((sum1 / n1 - sum2 / n2) / pooled)
+
+
+# --------------------------------------------------------------------------- #
+# Compute backends for the grouped aggregations
+# --------------------------------------------------------------------------- #
+# Per-group moments and null counts are the heaviest work on tall tables.
+# "pandas" computes them as one-hot matrix products on one thread; "polars"
+# and "duckdb" (optional installs) run the same group-bys multi-threaded.
+# Detectors, findings and the memo don't depend on the choice; `bench.py
+# --backends` checks that.
+BACKEND = os.environ.get("DATALITE_BACKEND", "pandas")
+BACKENDS = ("pandas", "polars", "duckdb")
+# values handed to an engine per query (columns × rows), bounding the copies
+ENGINE_BLOCK_VALUES = 1 << 27
+
+
+def _engine_group_sums(prof: DatasetProfile, cats: list[str], column,
+                       cols: list[str], shift: np.ndarray
+                       ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Non-null count, sum and sum of squares of ``column(n) - shift`` for
+    every `cols` entry, per group of each of `cats` stacked side by side
+    (as `_onehot_block` lays them out), computed by the BACKEND engine.
+
+    `column(n)` returns a float array (NaN = missing) or a boolean one.
+    """
+    if BACKEND not in BACKENDS:
+        raise ValueError(f"unknown backend {BACKEND!r}; use one of {BACKENDS}")
+    engine = pl if BACKEND == "polars" else duckdb
+    if engine is None:
+        raise ImportError(f"the {BACKEND} backend needs `pip install {BACKEND}`")
+    sizes = [prof.columns[c].n_unique for c in cats]
+    offsets = np.cumsum([0] + sizes)
+    out = np.zeros((3, offsets[-1], len(cols)))
+    groups = {f"g{i}": prof.columns[c].codes for i, c in enumerate(cats)}
+    run = _polars_sums if BACKEND == "polars" else _duckdb_sums
+    step = max(1, ENGINE_BLOCK_VALUES // max(prof.n_rows, 1))
+    for lo in range(0, len(cols), step):
+        batch = {f"v{j}": column(cols[j])
+                 for j in range(lo, min(lo + step, len(cols)))}
+        res = run(groups, batch, shift[lo:lo + len(batch)])
+        for (codes, sums), off in zip(res.values(), offsets):
+            out[:, off + codes, lo:lo + len(batch)] = sums
+    return out[0], out[1], out[2]
+
+
+def _polars_sums(groups: dict, values: dict, shift: np.ndarray) -> dict:
+    """``{group column: (codes present, 3 × groups × values sums)}``."""
+    df = pl.DataFrame({**groups, **values})
+    aggs = []
+    for (v, x), s in zip(values.items(), shift):
+        e = (pl.col(v).cast(pl.Float64) if x.dtype == bool else
+             pl.col(v).fill_nan(None) - float(s))
+        aggs += [e.count().alias(f"n_{v}"), e.sum().alias(f"s_{v}"),
+                 (e * e).sum().alias(f"q_{v}")]
+    # one lazy query per grouping, run together on polars' thread pool
+    frames = pl.collect_all([df.lazy().filter(pl.col(g) >= 0)
+                             .group_by(g).agg(aggs) for g in groups])
+    return {g: _engine_result(r.to_dict(as_series=False), g, values)
+            for g, r in zip(groups, frames)}
+
+
+def _duckdb_sums(groups: dict, values: dict, shift: np.ndarray) -> dict:
+    con = duckdb.connect()
+    try:
+        con.register("t", pd.DataFrame({**groups, **values}, copy=False))
+        aggs = []
+        for (v, x), s in zip(values.items(), shift):
+            e = (f"CAST({v} AS DOUBLE)" if x.dtype == bool else
+                 f"(nullif({v}, 'NaN'::DOUBLE) - {float(s)!r})")
+            aggs += [f"count({e}) AS n_{v}", f"coalesce(sum({e}), 0) AS s_{v}",
+                     f"coalesce(sum({e} * {e}), 0) AS q_{v}"]
+        return {g: _engine_result(con.execute(
+                    f"SELECT {g}, {', '.join(aggs)} FROM t "
+                    f"WHERE {g} >= 0 GROUP BY {g}").fetchnumpy(), g, values)
+                for g in groups}
+    finally:
+        con.close()
+
+
+def _engine_result(res: dict, g: str, values: dict) -> tuple:
+    codes = np.asarray(res[g], dtype=np.intp)
+    sums = np.array([[np.asarray(res[f"{a}_{v}"], dtype=float)
+                      for v in values] for a in "nsq"])
+    return codes, sums.transpose(0, 2, 1)
+
+
+# --------------------------------------------------------------------------- #
+# Pair screening: bound every pair cheaply, compute only the contenders
+# --------------------------------------------------------------------------- #
+# Segment and missingness detection look at every (grouping, column) pair.
+# Past PAIR_BUDGET pairs, each pair's best possible score is bounded first
+# and exact statistics are computed only for pairs whose bound still clears
+# the reporting threshold — strongest bound first, PAIR_BUDGET at most.
+PAIR_BUDGET = 20_000
+# screening bounds come from group statistics over this many sampled rows,
+# widened by SCREEN_Z standard errors (of Cohen's d, of missing rates)
+SCREEN_ROWS = 4096
+SCREEN_Z = 4.0
+
+
+def _within_budget(ub: np.ndarray, floor: float
+                   ) -> tuple[list[tuple[int, int]], int]:
+    """Indices of the entries of `ub` that reach `floor`, largest first,
+    at most PAIR_BUDGET of them, in row-major order; and how many more
+    reached it but were left out."""
+    i, j = np.nonzero(ub >= floor)
+    cut = max(len(i) - PAIR_BUDGET, 0)
+    if cut:
+        top = np.argpartition(-ub[i, j], PAIR_BUDGET - 1)[:PAIR_BUDGET]
+        i, j = i[top], j[top]
+    return sorted(zip(i.tolist(), j.tolist())), cut
+
+
+def _screen_sample(prof: DatasetProfile) -> np.ndarray:
+    return np.sort(np.random.default_rng(0).choice(
+        prof.n_rows, min(SCREEN_ROWS, prof.n_rows), replace=False))
+
+
+def _screen_segments(prof: DatasetProfile, cats: list[str], num: list[str],
+                     min_d: float, top_k: int
+                     ) -> tuple[list[tuple[int, int]], int]:
+    """(grouping, column) index pairs whose Cohen's d could reach `min_d`
+    and the top `top_k`, judged on a row sample, as `_within_budget()`.
+
+    Groupings with a level too rare to show up in the sample can't be
+    bounded and always pass.
+    """
+    idx = _screen_sample(prof)
+    onehot, offsets = _onehot_block(prof, cats, idx)
+    x = _float_block(prof.frame, num, idx, prof._shift(num))
+    ok = ~np.isnan(x)
+    x[~ok] = 0.0
+    # single precision is plenty for a bound and halves the products' cost
+    oh, x = onehot.T.astype(np.float32), x.astype(np.float32)
+    cnt, s1, s2 = (oh @ ok.astype(np.float32), oh @ x, oh @ (x * x))
+    cnt, s1, s2 = (a.astype(float) for a in (cnt, s1, s2))
+    ub = np.full((len(cats), len(num)), np.inf)
+    lb = np.zeros_like(ub)
+    for i, (c, off) in enumerate(zip(cats, offsets)):
+        g = slice(off, off + prof.columns[c].n_unique)
+        if (onehot[:, g].sum(axis=0) < 3).any():
+            continue
+        n, a, b = cnt[g], s1[g], s2[g]
+        valid = n >= 3
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = a / n
+            hi = np.argmax(np.where(valid, mean, -np.inf), axis=0)[None]
+            lo = np.argmin(np.where(valid, mean, np.inf), axis=0)[None]
+            pick = lambda v, k: np.take_along_axis(v, k, axis=0)[0]
+            n1, n2 = pick(n, hi), pick(n, lo)
+            ss = b - a * a / n
+            pooled = np.sqrt((pick(ss, hi) + pick(ss, lo)) / (n1 + n2 - 2))
+            d = (pick(mean, hi) - pick(mean, lo)) / pooled
+            se = np.sqrt((n1 + n2) / (n1 * n2) + d * d / (2 * (n1 + n2)))
+        bounded = (valid.sum(axis=0) >= 2) & (pooled > 0)
+        ub[i, bounded] = (d + SCREEN_Z * se)[bounded]
+        lb[i, bounded] = np.maximum(d - SCREEN_Z * se, 0.0)[bounded]
+    # nothing below the k-th best lower bound can make the top k
+    kth = np.sort(lb, axis=None)[-top_k] if lb.size >= top_k else 0.0
+    return _within_budget(ub, max(min_d, kth))
+
+
+def _screen_missingness(prof: DatasetProfile, cats: list[str],
+                        cols: list[str], pattern_spread: float
+                        ) -> tuple[list[tuple[int, int]], int]:
+    """(grouping, column) index pairs whose missing-rate spread could reach
+    `pattern_spread`, as `_within_budget()`.
+
+    Each group's missing rate on a row sample is widened by SCREEN_Z
+    standard errors; the spread can't exceed the widest gap between those
+    intervals. Nor can it exceed the column's nulls (or values) over the
+    smallest group's size, which holds exactly. Groupings with a level too
+    rare to show up in the sample are bounded by the latter alone.
+    """
+    smallest = np.zeros(len(cats))
+    for i, c in enumerate(cats):
+        codes = prof.columns[c].codes
+        sizes = np.bincount(codes[codes >= 0])
+        sizes = sizes[sizes >= 3]
+        smallest[i] = sizes.min() if len(sizes) >= 2 else np.inf
+    rarer = np.array([min(prof.columns[m].n_null, prof.columns[m].count)
+                      for m in cols], dtype=float)
+    ub = np.minimum(rarer[None, :] / smallest[:, None], 1.0)
+
+    idx = _screen_sample(prof)
+    onehot, offsets = _onehot_block(prof, cats, idx)
+    ind = prof.frame[cols].iloc[idx].isna().to_numpy(dtype=np.float32)
+    n = onehot.sum(axis=0).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (onehot.T.astype(np.float32) @ ind).astype(float) / n[:, None]
+        # + 1/n keeps groups with no (or only) nulls in the sample honest
+        margin = SCREEN_Z * np.sqrt((rate * (1 - rate) + 1 / n[:, None])
+                                    / n[:, None])
+    for i, (c, off) in enumerate(zip(cats, offsets)):
+        g = slice(off, off + prof.columns[c].n_unique)
+        if (n[g] < 3).any():
+            continue
+        gap = ((rate[g] + margin[g]).max(axis=0)
+               - (rate[g] - margin[g]).min(axis=0))
+        ub[i] = np.minimum(ub[i], gap)
+    for j, m in enumerate(cols):
+        if m in cats:
+            ub[cats.index(m), j] = -np.inf
+    return _within_budget(ub, pattern_spread)
 
 
 # --------------------------------------------------------------------------- #
 # Detectors
 # --------------------------------------------------------------------------- #
 def detect_correlations(df: pd.DataFrame, threshold: float = 0.30,
-                        top_k: int = 4) -> list[Finding]:
-    num = _numeric_cols(df)
+                        top_k: int = 4, method: str = "pearson",
+                        profile: Optional[DatasetProfile] = None
+                        ) -> list[Finding]:
+    """Strongest pairwise correlations; `method` "spearman" catches
+    monotonic rather than only linear relationships."""
+    prof = _profile(df, profile)
+    num = prof.numeric
     if len(num) < 2:
         return []
-    corr = df[num].corr(numeric_only=True)
-    seen, cands = set(), []
-    for i, a in enumerate(num):
-        for b in num[i + 1:]:
-            r = corr.loc[a, b]
-            if pd.isna(r) or abs(r) < threshold:
-                continue
-            cands.append((abs(r), a, b, float(r)))
-    cands.sort(reverse=True)
+    corr, counts = prof.corr_counts(num, method)
+    r = corr.to_numpy()
+    with np.errstate(invalid="ignore"):
+        i, j = np.nonzero(np.triu(np.abs(r) >= threshold, k=1))
+    absr = np.abs(r[i, j])
+    if len(absr) > top_k:
+        # keep everything tied with the k-th strongest so order is as sorted
+        kth = np.partition(absr, len(absr) - top_k)[len(absr) - top_k]
+        keep = absr >= kth
+        i, j, absr = i[keep], j[keep], absr[keep]
+    cands = sorted(((a, num[x], num[y], float(r[x, y]), x, y)
+                    for a, x, y in zip(absr, i, j)), reverse=True)
+    _note(prof.n_rows, len(num), len(num) * (len(num) - 1) // 2)
+    symbol, key = (("ρ", "spearman_rho") if method == "spearman" else
+                   ("r", "pearson_r"))
+    kind = "monotonic" if method == "spearman" else "linear"
     findings = []
-    for absr, a, b, r in cands[:top_k]:
+    for absr, a, b, r, x, y in cands[:top_k]:
         direction = "move together" if r > 0 else "move in opposite directions"
         strength = ("a strong" if absr >= 0.7 else
                     "a moderate" if absr >= 0.5 else "a noticeable")
         findings.append(Finding(
             kind="correlation",
-            headline=f"{a} and {b} {direction} (r = {r:+.2f}).",
-            detail=f"There's {strength} linear relationship between the two.",
+            headline=f"{a} and {b} {direction} ({symbol} = {r:+.2f}).",
+            detail=f"There's {strength} {kind} relationship between the two.",
             score=min(absr, 1.0),
             chart={"type": "scatter", "x": a, "y": b},
-            evidence={"pearson_r": round(r, 3), "x": a, "y": b,
-                      "n": int(df[[a, b]].dropna().shape[0])},
+            evidence={key: round(r, 3), "x": a, "y": b,
+                      "n": int(counts[x, y])},
         ))
-        seen.add(frozenset((a, b)))
     return findings
 
 
 def detect_segment_differences(df: pd.DataFrame, min_d: float = 0.5,
-                               top_k: int = 4) -> list[Finding]:
-    num = _numeric_cols(df)
-    cats = _categorical_cols(df, max_card=8)
+                               top_k: int = 4,
+                               profile: Optional[DatasetProfile] = None
+                               ) -> list[Finding]:
+    prof = _profile(df, profile)
+    num = prof.numeric
+    cats = prof.categorical(max_card=8)
+    if not num or not cats:
+        return []
+    unchecked = 0
+    if len(cats) * len(num) <= PAIR_BUDGET or prof.frame is None:
+        moments, shift = prof.group_moments(cats, num)
+        groups = [(c, num, moments[c], shift) for c in cats]
+    else:
+        screened = {}
+        pairs, unchecked = _screen_segments(prof, cats, num, min_d, top_k)
+        for i, j in pairs:
+            screened.setdefault(cats[i], []).append(num[j])
+        groups = []
+        for c, cols in screened.items():
+            moments, shift = prof.group_moments([c], cols)
+            groups.append((c, cols, moments[c], shift))
     cands = []
-    for c in cats:
-        for n in num:
-            grp = df[[c, n]].dropna().groupby(c)[n]
-            means = grp.mean()
-            sizes = grp.size()
-            # only groups with at least a few observations
-            valid = means[sizes >= 3]
-            if len(valid) < 2:
-                continue
-            hi, lo = valid.idxmax(), valid.idxmin()
-            d = _cohen_d(df.loc[df[c] == hi, n], df.loc[df[c] == lo, n])
-            if abs(d) < min_d:
-                continue
-            cands.append((abs(d), c, n, hi, lo, float(means[hi]),
-                          float(means[lo]), means))
+    for c, cols, (cnt, s1, s2), shift in groups:
+        labels = prof.columns[c].uniques
+        for j, n in enumerate(cols):
+            cand = _segment_candidate(c, n, labels, cnt[:, j], s1[:, j],
+                                      s2[:, j], shift[j], min_d)
+            if cand:
+                cands.append(cand)
+    _note(prof.n_rows, len(cats) + len(num),
+          sum(len(cols) for _, cols, _, _ in groups))
+    findings = _segment_findings(cands, top_k)
+    if unchecked:  # over PAIR_BUDGET: a stronger pair may have been missed
+        for f in findings:
+            f.evidence["pairs_not_checked"] = unchecked
+    return findings
+
+
+def _segment_candidate(c, n, labels, cnt, s1, s2, shift, min_d):
+    """Best-vs-worst group comparison of `n` by `c` from per-group moments."""
+    present = cnt > 0
+    means = pd.Series(s1[present] / cnt[present] + shift,
+                      index=labels[present])
+    # only groups with at least a few observations
+    valid = np.flatnonzero(cnt >= 3)
+    if len(valid) < 2:
+        return None
+    group_means = s1[valid] / cnt[valid]
+    hi, lo = valid[np.argmax(group_means)], valid[np.argmin(group_means)]
+    d = _cohen_d(cnt[hi], s1[hi], s2[hi], cnt[lo], s1[lo], s2[lo])
+    if abs(d) < min_d:
+        return None
+    return (abs(d), c, n, labels[hi], labels[lo],
+            float(s1[hi] / cnt[hi] + shift), float(s1[lo] / cnt[lo] + shift),
+            means)
+
+
+def _segment_findings(cands, top_k) -> list[Finding]:
     cands.sort(key=lambda t: t[0], reverse=True)
     findings = []
     for d, c, n, hi, lo, hi_mean, lo_mean, means in cands[:top_k]:
@@ -183,31 +1245,32 @@ def detect_segment_differences(df: pd.DataFrame, min_d: float = 0.5,
 
 
 def detect_imbalance(df: pd.DataFrame, threshold: float = 0.70,
-                     top_k: int = 3) -> list[Finding]:
-    cats = _categorical_cols(df, max_card=12)
+                     top_k: int = 3,
+                     profile: Optional[DatasetProfile] = None) -> list[Finding]:
+    prof = _profile(df, profile)
     cands = []
+    cats = prof.categorical(max_card=12)
+    _note(prof.n_rows, len(cats), len(cats))
     for c in cats:
-        vc = df[c].value_counts(normalize=True, dropna=True)
-        if vc.empty:
-            continue
+        counts = prof.value_counts(c)
+        vc = counts / counts.sum()
         top_share = float(vc.iloc[0])
         k = len(vc)
         if top_share < threshold or k < 2:
             continue
         # normalize: 1/k (perfectly even) -> 0, 1.0 (single class) -> 1
         norm = (top_share - 1 / k) / (1 - 1 / k)
-        cands.append((norm, c, vc.index[0], top_share, vc))
+        cands.append((norm, c, vc.index[0], top_share, counts))
     cands.sort(reverse=True, key=lambda t: t[0])
     findings = []
-    for norm, c, top, share, vc in cands[:top_k]:
+    for norm, c, top, share, counts in cands[:top_k]:
         findings.append(Finding(
             kind="imbalance",
             headline=f"{c} is dominated by '{top}' ({share*100:.0f}% of rows).",
             detail="Heavy class imbalance — worth knowing before any modelling.",
             score=min(norm, 1.0),
             chart={"type": "value_counts", "col": c,
-                   "counts": {str(k): int(v) for k, v in
-                              df[c].value_counts(dropna=True).items()}},
+                   "counts": {str(k): int(v) for k, v in counts.items()}},
             evidence={"column": c, "top_value": str(top),
                       "top_share": round(share, 3)},
         ))
@@ -215,64 +1278,71 @@ def detect_imbalance(df: pd.DataFrame, threshold: float = 0.70,
 
 
 def detect_outliers(df: pd.DataFrame, min_frac: float = 0.02,
-                    top_k: int = 3) -> list[Finding]:
-    num = _numeric_cols(df)
+                    top_k: int = 3,
+                    profile: Optional[DatasetProfile] = None) -> list[Finding]:
+    prof = _profile(df, profile)
     cands = []
-    for n in num:
-        s = df[n].dropna()
-        if len(s) < 8:
+    quartiles = prof.quartiles([n for n in prof.numeric
+                                if prof.columns[n].count >= 8])
+    for n, q in quartiles.items():
+        if q is None:
             continue
-        q1, q3 = s.quantile(0.25), s.quantile(0.75)
+        count = prof.columns[n].count
+        q1, med, q3 = q
         iqr = q3 - q1
         if iqr == 0:
             continue
         lo, hi = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-        mask = (s < lo) | (s > hi)
-        frac = float(mask.mean())
+        n_out = prof.count_outside(n, lo, hi)
+        frac = n_out / count
         if frac < min_frac:
             continue
-        cands.append((frac, n, int(mask.sum()), float(lo), float(hi)))
+        cands.append((frac, n, n_out, float(lo), float(hi), q))
+    _note(prof.n_rows, len(prof.numeric), len(prof.numeric))
     cands.sort(reverse=True, key=lambda t: t[0])
     findings = []
-    for frac, n, count, lo, hi in cands[:top_k]:
+    for frac, n, count, lo, hi, (q1, med, q3) in cands[:top_k]:
+        evidence = {"column": n, "n_outliers": count,
+                    "lower_bound": round(lo, 2), "upper_bound": round(hi, 2)}
+        err = prof.quartile_error(n)
+        if err:
+            # the count follows the fences, so it is approximate too
+            evidence["estimated"] = (f"bounds and count, from a quantile "
+                                     f"sketch (ranks within ±{err:.2%})")
         findings.append(Finding(
             kind="outliers",
             headline=f"{n} has {count} outlier value(s) "
                      f"({frac*100:.1f}% of rows) outside the typical range.",
             detail="These sit beyond 1.5×IQR — check for errors or rare events.",
             score=min(frac / 0.10, 1.0),
-            chart={"type": "box", "col": n},
-            evidence={"column": n, "n_outliers": count,
-                      "lower_bound": round(lo, 2), "upper_bound": round(hi, 2)},
+            chart={"type": "box", "col": n, "q1": q1, "med": med, "q3": q3},
+            evidence=evidence,
         ))
     return findings
 
 
 def detect_missingness(df: pd.DataFrame, pattern_spread: float = 0.30,
-                       plain_frac: float = 0.05) -> list[Finding]:
+                       plain_frac: float = 0.05,
+                       profile: Optional[DatasetProfile] = None
+                       ) -> list[Finding]:
+    prof = _profile(df, profile)
     findings = []
-    cats = _categorical_cols(df, max_card=8)
-    miss = df.isna().mean()
-    cols_with_missing = [c for c in df.columns if miss[c] > 0]
-
-    # (a) the interesting case: missingness depends on another column
-    for m in cols_with_missing:
-        ind = df[m].isna()
-        best = None
-        for c in cats:
-            if c == m:
-                continue
-            rates = ind.groupby(df[c]).mean()
-            sizes = df[c].value_counts()
-            rates = rates[sizes[rates.index] >= 3]
-            if len(rates) < 2:
-                continue
-            spread = float(rates.max() - rates.min())
-            if spread >= pattern_spread and (best is None or spread > best[0]):
-                best = (spread, c, rates.idxmax(), float(rates.max()),
-                        rates.idxmin(), float(rates.min()))
-        if best:
-            spread, c, hi_g, hi_r, lo_g, lo_r = best
+    cats = prof.categorical(max_card=8)
+    miss = {c: p.null_frac for c, p in prof.columns.items()}
+    cols_with_missing = [c for c in prof.columns if miss[c] > 0]
+    _note(prof.n_rows, len(set(cats) | set(cols_with_missing)),
+          len(cats) * len(cols_with_missing) + len(cols_with_missing))
+
+    # (a) the interesting case: missingness depends on another column.
+    # Every per-group missing rate for every (column, grouping) pair comes
+    # out of one null-indicator × one-hot product.
+    unchecked = [0]
+    if cols_with_missing and cats:
+        for m, c, rates, hi, lo in _missingness_screened(
+                prof, cats, cols_with_missing, pattern_spread, unchecked):
+            spread = float(rates.iloc[hi] - rates.iloc[lo])
+            hi_g, hi_r = rates.index[hi], float(rates.iloc[hi])
+            lo_g, lo_r = rates.index[lo], float(rates.iloc[lo])
             findings.append(Finding(
                 kind="missingness_pattern",
                 headline=(f"{m} is missing far more often when {c} = '{hi_g}' "
@@ -282,8 +1352,7 @@ def detect_missingness(df: pd.DataFrame, pattern_spread: float = 0.30,
                 score=min(spread, 1.0),
                 chart={"type": "missing_by_group", "missing_col": m,
                        "group_col": c,
-                       "rates": {str(k): float(v) for k, v in
-                                 ind.groupby(df[c]).mean().items()}},
+                       "rates": {str(k): float(v) for k, v in rates.items()}},
                 evidence={"missing_col": m, "group_col": c,
                           "max_rate_group": str(hi_g), "max_rate": round(hi_r, 3),
                           "min_rate_group": str(lo_g), "min_rate": round(lo_r, 3)},
@@ -302,31 +1371,107 @@ def detect_missingness(df: pd.DataFrame, pattern_spread: float = 0.30,
                    "value": f"{miss[c]*100:.0f}%"},
             evidence={"column": c, "missing_fraction": round(float(miss[c]), 3)},
         ))
+    if unchecked[0]:  # over PAIR_BUDGET: a pattern may have been missed
+        for f in findings:
+            f.evidence["pairs_not_checked"] = unchecked[0]
     return findings
 
 
-def detect_hygiene(df: pd.DataFrame) -> list[Finding]:
+def _missingness_screened(prof, cats, cols, pattern_spread, unchecked):
+    """`_missingness_patterns()` over every pair, or past PAIR_BUDGET pairs
+    over those `_screen_missingness()` lets through. ``unchecked[0]`` is set
+    to the number of pairs the budget left out."""
+    if len(cats) * len(cols) <= PAIR_BUDGET or prof.frame is None:
+        sizes, nulls = prof.group_null_counts(cats, cols)
+        yield from _missingness_patterns(prof, cats, cols, sizes, nulls,
+                                         pattern_spread)
+        return
+    pairs, unchecked[0] = _screen_missingness(prof, cats, cols,
+                                              pattern_spread)
+    if not pairs:
+        return
+    # one product over the groupings and columns that survived
+    ci = sorted({i for i, _ in pairs})
+    mj = sorted({j for _, j in pairs})
+    allowed = np.zeros((len(cats), len(cols)), dtype=bool)
+    allowed[tuple(zip(*pairs))] = True
+    sub_cats, sub_cols = [cats[i] for i in ci], [cols[j] for j in mj]
+    sizes, nulls = prof.group_null_counts(sub_cats, sub_cols)
+    yield from _missingness_patterns(prof, sub_cats, sub_cols, sizes, nulls,
+                                     pattern_spread, allowed[np.ix_(ci, mj)])
+
+
+def _missingness_patterns(prof, cats, cols, sizes, nulls, pattern_spread,
+                          allowed=None):
+    """Pick, per column in `cols`, the grouping whose missing rates spread most.
+
+    `sizes` holds the row count of every group of every column in `cats`
+    (stacked side by side) and `nulls` the matching ``groups × cols`` null
+    counts; `allowed`, a ``cats × cols`` mask, limits the pairs considered.
+    Yields ``(col, group_col, rates, hi, lo)`` where `hi`/`lo` index
+    the highest and lowest rate among groups with at least 3 rows.
+    """
+    rates = nulls / sizes[:, None]
+    spreads = np.full((len(cats), len(cols)), -np.inf)
+    extremes = {}
+    off = 0
+    for i, c in enumerate(cats):
+        k = prof.columns[c].n_unique
+        g = slice(off, off + k)
+        off += k
+        valid = np.flatnonzero(sizes[g] >= 3)
+        if len(valid) < 2:
+            continue
+        r = rates[g][valid]
+        hi, lo = valid[np.argmax(r, axis=0)], valid[np.argmin(r, axis=0)]
+        spreads[i] = r.max(axis=0) - r.min(axis=0)
+        extremes[c] = (g, hi, lo)
+    for j, m in enumerate(cols):
+        if m in extremes:
+            spreads[cats.index(m), j] = -np.inf
+    if allowed is not None:
+        spreads[~allowed] = -np.inf
+    best = np.argmax(spreads, axis=0)
+    for j, m in enumerate(cols):
+        i = best[j]
+        if not spreads[i, j] >= pattern_spread:
+            continue
+        c = cats[i]
+        g, hi, lo = extremes[c]
+        r = pd.Series(rates[g, j], index=prof.columns[c].uniques)
+        yield m, c, r, hi[j], lo[j]
+
+
+def detect_hygiene(df: pd.DataFrame,
+                   profile: Optional[DatasetProfile] = None) -> list[Finding]:
+    prof = _profile(df, profile)
     findings = []
-    n_rows = len(df)
+    n_rows = prof.n_rows
     if n_rows == 0:
         return findings
+    _note(n_rows, prof.n_cols, prof.n_cols + 1)
 
     # duplicate rows
-    dups = int(df.duplicated().sum())
+    dups = prof.n_duplicates
     if dups > 0:
         frac = dups / n_rows
+        evidence = {"duplicate_rows": dups, "fraction": round(frac, 3)}
+        stats = prof.duplicate_stats()
+        if stats is not None:
+            evidence.update(clusters=stats[1], largest_cluster=stats[2])
         findings.append(Finding(
             kind="duplicates",
             headline=f"{dups} row(s) ({frac*100:.0f}%) are exact duplicates.",
             detail="Duplicate rows can quietly skew counts and averages.",
             score=min(frac / 0.10, 1.0),
             chart={"type": "metric", "label": "Duplicate rows", "value": str(dups)},
-            evidence={"duplicate_rows": dups, "fraction": round(frac, 3)},
+            evidence=evidence,
         ))
 
     # constant & id-like columns
-    for c in df.columns:
-        nun = df[c].nunique(dropna=True)
+    ids = []
+    for c, p in prof.columns.items():
+        nun = p.n_unique
         if nun <= 1:
             findings.append(Finding(
                 kind="hygiene",
@@ -335,8 +1480,9 @@ def detect_hygiene(df: pd.DataFrame) -> list[Finding]:
                 chart={"type": "metric", "label": c, "value": "constant"},
                 evidence={"column": c, "unique_values": int(nun)},
             ))
-        elif (nun == n_rows and n_rows >= 25
-              and not pd.api.types.is_float_dtype(df[c])):
+        elif (nun == n_rows and n_rows >= 25 and not p.is_float
+              and not p.n_unique_is_bound):
+            ids.append(c)
             findings.append(Finding(
                 kind="hygiene",
                 headline=f"{c} looks like an identifier (every value is unique).",
@@ -345,6 +1491,24 @@ def detect_hygiene(df: pd.DataFrame) -> list[Finding]:
                 chart={"type": "metric", "label": c, "value": "unique id"},
                 evidence={"column": c, "unique_values": int(nun)},
             ))
+
+    # rows that repeat once their ID columns are ignored
+    near = (prof.duplicate_stats(exclude=ids)
+            if ids and len(ids) < prof.n_cols else None)
+    if near is not None and near[0] > dups:
+        n_near, frac = near[0], near[0] / n_rows
+        findings.append(Finding(
+            kind="near_duplicates",
+            headline=(f"{n_near} row(s) ({frac*100:.0f}%) repeat another row "
+                      f"apart from {', '.join(ids)}."),
+            detail="The same record may have been entered twice under "
+                   "different IDs.",
+            score=min(frac / 0.10, 1.0),
+            chart={"type": "metric", "label": "Near duplicates",
+                   "value": str(n_near)},
+            evidence={"duplicate_rows": n_near, "ignoring": ", ".join(ids),
+                      "clusters": near[1], "largest_cluster": near[2]},
+        ))
     return findings
 
 
@@ -357,43 +1521,421 @@ DETECTORS = [
     detect_hygiene,
 ]
 
+# How `analyze()` schedules the detectors. "thread" suits the pandas/numpy
+# work, which mostly releases the GIL; "process" isolates detectors fully at
+# the cost of pickling the frame; "serial" runs them one after another
+# (no timeouts). MAX_WORKERS=None means one thread per detector, or one
+# process per detector up to the CPU count. Threads come from a pool shared
+# by every call, so detectors abandoned by a timeout cannot pile up.
+EXECUTOR = "thread"
+MAX_WORKERS: Optional[int] = None
+DETECTOR_TIMEOUT = 30.0   # wall-clock seconds per detector
+# Worker processes start from a clean server process rather than a fork of
+# this one: forking a multi-threaded host (the Streamlit server) can copy
+# locks held by other threads and deadlock the child.
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn")
+# submission order, cheapest first: with fewer workers than detectors, or a
+# `budget` shorter than the slow ones need, the quick findings still arrive
+CHEAP_FIRST = ("detect_hygiene", "detect_imbalance", "detect_missingness",
+               "detect_segment_differences", "detect_correlations",
+               "detect_outliers")
+
 
 # --------------------------------------------------------------------------- #
 # Orchestration
 # --------------------------------------------------------------------------- #
-def dataset_summary(df: pd.DataFrame) -> dict:
+def dataset_summary(df: pd.DataFrame,
+                    profile: Optional[DatasetProfile] = None) -> dict:
     """Cheap, factual one-liner stats for the hero section (no LLM guessing)."""
-    num = _numeric_cols(df)
-    cats = _categorical_cols(df, max_card=10**9)
-    miss = float(df.isna().mean().mean()) if df.size else 0.0
+    prof = _profile(df, profile)
+    num = prof.numeric
+    rows, cols = prof.n_rows, prof.n_cols
+    miss = (float(np.mean([p.null_frac for p in prof.columns.values()]))
+            if rows and cols else 0.0)
     return {
-        "rows": int(df.shape[0]),
-        "cols": int(df.shape[1]),
+        "rows": rows,
+        "cols": cols,
         "numeric": len(num),
-        "categorical": len([c for c in df.columns if c not in num]),
+        "categorical": cols - len(num),
         "missing_pct": round(miss * 100, 1),
-        "duplicates": int(df.duplicated().sum()),
+        "duplicates": prof.n_duplicates,
         "sentence": (
-            f"{df.shape[0]:,} rows × {df.shape[1]} columns — "
-            f"{len(num)} numeric, {df.shape[1] - len(num)} non-numeric, "
+            f"{rows:,} rows × {cols} columns — "
+            f"{len(num)} numeric, {cols - len(num)} non-numeric, "
             f"{miss*100:.0f}% missing overall."
         ),
     }
 
 
-def analyze(df: pd.DataFrame, limit: int = 8) -> list[Finding]:
-    """Run all detectors, dedupe, and return the most interesting findings."""
-    if df is None or df.empty:
-        return []
+def column_summary(df: Optional[pd.DataFrame],
+                   profile: Optional[DatasetProfile] = None) -> pd.DataFrame:
+    """Per-column table for the "Explore" panel, read off the profile.
 
-    findings: list[Finding] = []
-    for det in DETECTORS:
+    Stands in for ``df.describe(include="all")`` without another pass over
+    the frame: counts, distinct values and moments come from the profile,
+    quartiles and ranges from its memoized statistics. A distinct count
+    prefixed with "~" is an estimate, one with "≥" a stream's cap.
+    """
+    prof = _profile(df, profile)
+    quart = prof.quartiles(prof.numeric)
+    approx = "≥" if isinstance(prof, StreamProfile) else "~"
+    rows = {}
+    for c, p in prof.columns.items():
+        total = p.count + p.n_null
+        row = {"kind": p.kind, "count": p.count, "missing": p.n_null,
+               "missing %": round(100 * p.n_null / total, 1) if total else 0.0,
+               "distinct": f"{approx}{p.n_unique:,}" if p.n_unique_is_bound
+               else f"{p.n_unique:,}"}
+        if p.kind == "numeric":
+            lo_hi = prof.value_range(c) or (np.nan, np.nan)
+            q = quart.get(c) or (np.nan,) * 3
+            row.update(mean=p.mean, std=p.std, min=lo_hi[0], **{
+                "25%": q[0], "50%": q[1], "75%": q[2]}, max=lo_hi[1])
+        elif p.uniques is not None and p.count:
+            vc = prof.value_counts(c)
+            row.update(top=str(vc.index[0]), freq=int(vc.iloc[0]))
+        rows[c] = row
+    cols = ["kind", "count", "missing", "missing %", "distinct", "mean",
+            "std", "min", "25%", "50%", "75%", "max", "top", "freq"]
+    out = pd.DataFrame.from_dict(rows, orient="index")
+    return out.reindex(columns=[c for c in cols if c in out.columns])
+
+
+@dataclass
+class DetectorRun:
+    """How one detector fared during `run_analysis()`."""
+
+    name: str
+    status: str = "ok"              # "ok" | "error" | "timeout"
+    seconds: float = 0.0            # wall time; the budget for timeouts
+    n_findings: int = 0
+    error: str = ""                 # repr of the exception, if any
+    # filled in by `run_analysis(instrument=True)`
+    rows: int = 0                   # rows and columns the detector scanned
+    cols: int = 0
+    candidates: int = 0             # pairs/columns it scored
+    peak_mb: Optional[float] = None  # Python-heap peak above the baseline
+    traceback: str = ""
+
+
+@dataclass
+class Analysis:
+    """Ranked findings plus a record of every detector that produced them."""
+
+    findings: list[Finding]
+    runs: list[DetectorRun] = field(default_factory=list)
+    sample_rows: int = 0            # rows screened when sampling, 0 = all
+    # a progress snapshot, or a sampled edition the budget cut short
+    partial: bool = False
+
+    @property
+    def dropped(self) -> list[DetectorRun]:
+        return [r for r in self.runs if r.status != "ok"]
+
+    def diagnostics(self) -> dict:
+        """JSON-ready record of how the analysis ran, for monitoring."""
+        return _jsonable({"sample_rows": self.sample_rows,
+                          "partial": self.partial,
+                          "n_findings": len(self.findings),
+                          "detectors": [asdict(r) for r in self.runs]})
+
+
+def _run_detector(det, df, prof) -> tuple[list[Finding], float, dict]:
+    probe = {}
+    token = _probe.set(probe)
+    t0 = time.perf_counter()
+    try:
+        out = det(df, profile=prof)
+    finally:
+        _probe.reset(token)
+    return out, time.perf_counter() - t0, probe
+
+
+def _run_instrumented(df, prof, detectors):
+    """Run `detectors` one at a time under tracemalloc, recording everything.
+
+    Serial on purpose: tracemalloc's peak is process-wide, so it is only
+    attributable to one detector when nothing else runs. No timeouts apply.
+    """
+    runs = [DetectorRun(det.__name__) for det in detectors]
+    results: list[list[Finding]] = [[] for _ in detectors]
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        for i, det in enumerate(detectors):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            t0 = time.perf_counter()
+            try:
+                results[i], runs[i].seconds, probe = _run_detector(det, df,
+                                                                   prof)
+                for k, v in probe.items():
+                    setattr(runs[i], k, v)
+            except Exception as e:
+                runs[i].status, runs[i].error = "error", repr(e)
+                runs[i].seconds = time.perf_counter() - t0
+                runs[i].traceback = traceback.format_exc()
+            peak = tracemalloc.get_traced_memory()[1]
+            runs[i].peak_mb = round((peak - base) / 2**20, 3)
+    finally:
+        if started:
+            tracemalloc.stop()
+    return results, runs
+
+
+def _cost_order(detectors) -> list[int]:
+    rank = {name: i for i, name in enumerate(CHEAP_FIRST)}
+    return sorted(range(len(detectors)),
+                  key=lambda i: rank.get(detectors[i].__name__, len(rank)))
+
+
+_THREAD_POOLS: dict[int, ThreadPoolExecutor] = {}
+# (data key, detector name) -> future of a threaded run not yet finished
+_IN_FLIGHT: dict = {}
+_POOL_LOCK = threading.RLock()
+
+
+def _submit_thread(size, key, det, df, prof):
+    """Submit `det` to the shared pool of `size` threads, or join its run
+    on the same data (`key`) if one is still going, e.g. one a previous
+    call abandoned."""
+    with _POOL_LOCK:
+        slot = None if key is None else (key, det.__name__)
+        fut = _IN_FLIGHT.get(slot)
+        if fut is not None:
+            return fut
+        pool = _THREAD_POOLS.get(size)
+        if pool is None:
+            pool = _THREAD_POOLS[size] = ThreadPoolExecutor(
+                max_workers=size, thread_name_prefix="detector")
+        fut = pool.submit(_run_detector, det, df, prof)
+        if slot is not None:
+            _IN_FLIGHT[slot] = fut
+            fut.add_done_callback(lambda f: _forget(slot, f))
+        return fut
+
+
+def _forget(slot, fut) -> None:
+    with _POOL_LOCK:
+        if _IN_FLIGHT.get(slot) is fut:
+            del _IN_FLIGHT[slot]
+
+
+def _note_pid(pids) -> None:
+    # process pool initializer: report this worker so it can be killed
+    pids.put(os.getpid())
+
+
+def _kill_workers(pids, n) -> None:
+    """Terminate the `n` workers reporting to `pids`, waiting a little for
+    any still starting up to report."""
+    for _ in range(n):
         try:
-            findings.extend(det(df))
-        except Exception:
-            # one misbehaving detector must never take down the whole report
-            continue
+            pid = pids.get(timeout=5)
+        except queue.Empty:
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _schedule(df, prof, detectors, executor, max_workers, timeout,
+              deadline=None, done_cb=None, key=None):
+    """Run `detectors` on a pool; returns (findings per detector, runs).
+
+    Every detector gets `timeout` seconds of wall-clock from submission (so
+    with fewer workers than detectors, time spent queued counts), and none
+    runs past `deadline` (a `time.perf_counter()` value). Late ones are
+    dropped and reported as "timeout" — a thread cannot be killed, so it
+    finishes in the background and its result is ignored; process workers
+    are terminated. A detector whose thread is still running on the same
+    data (`key`, a hashable naming it) is waited on rather than started
+    again. Detectors are submitted in `CHEAP_FIRST` order, and
+    `done_cb(findings, run)` is called as each one finishes.
+    """
+    runs = [DetectorRun(det.__name__) for det in detectors]
+    results: list[list[Finding]] = [[] for _ in detectors]
+    order = _cost_order(detectors)
+    if deadline is not None and time.perf_counter() >= deadline:
+        for run in runs:  # out of time before the first one started
+            run.status = "timeout"
+        return results, runs
+    if executor == "serial":
+        # nothing can be interrupted: the deadline is checked in between
+        for i in order:
+            if deadline is not None and time.perf_counter() >= deadline:
+                runs[i].status = "timeout"
+                continue
+            try:
+                results[i], runs[i].seconds, _ = _run_detector(detectors[i],
+                                                               df, prof)
+            except Exception as e:
+                runs[i].status, runs[i].error = "error", repr(e)
+            if done_cb is not None:
+                done_cb(results[i], runs[i])
+        return results, runs
+
+    pool = pids = None
+    if executor == "process":
+        n_procs = max_workers or min(len(detectors), os.cpu_count() or 1)
+        pids = MP_CONTEXT.Queue()
+        pool = ProcessPoolExecutor(max_workers=n_procs, mp_context=MP_CONTEXT,
+                                   initializer=_note_pid, initargs=(pids,))
+    t0 = time.perf_counter()
+    end = t0 + timeout if deadline is None else min(t0 + timeout, deadline)
+    if pool is None:
+        size = max_workers or len(detectors)
+        futures = {_submit_thread(size, key, detectors[i], df, prof): i
+                   for i in order}
+    else:
+        futures = {pool.submit(_run_detector, detectors[i], df, prof): i
+                   for i in order}
+    late = set(futures)
+    while late:
+        done, late = wait(late, timeout=max(end - time.perf_counter(), 0),
+                          return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for fut in done:
+            i = futures[fut]
+            if fut.cancelled():
+                # a call it was shared with gave up before it started
+                runs[i].status = "timeout"
+                runs[i].seconds = time.perf_counter() - t0
+                continue
+            try:
+                results[i], runs[i].seconds, _ = fut.result()
+            except Exception as e:
+                # one misbehaving detector must never take down the report
+                runs[i].status, runs[i].error = "error", repr(e)
+            if done_cb is not None:
+                done_cb(results[i], runs[i])
+    for fut in late:
+        i = futures[fut]
+        runs[i].status = "timeout"
+        runs[i].seconds = time.perf_counter() - t0
+        fut.cancel()  # only stops one still queued
+    if pool is not None:
+        if late:
+            # every worker started at submission (fewer only if there were
+            # fewer detectors); killing them first breaks the pool, which
+            # fails whatever was still queued before shutdown cancels it
+            _kill_workers(pids, min(n_procs, len(detectors)))
+        pool.shutdown(wait=True, cancel_futures=True)
+        pids.close()
+    return results, runs
+
+
+def run_analysis(df: pd.DataFrame, limit: int = 8,
+                 profile: Optional[DatasetProfile] = None,
+                 executor: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 sample_rows: Optional[int] = None,
+                 verify_top: Optional[int] = None,
+                 instrument: bool = False,
+                 budget: Optional[float] = None,
+                 progress: Optional[Callable[[Analysis], None]] = None
+                 ) -> Analysis:
+    """Like `analyze()`, but also reports how each detector ran.
+
+    Detectors run side by side on a thread or process pool (`executor`,
+    defaulting to `EXECUTOR`); each one that overruns `timeout` seconds
+    (default `DETECTOR_TIMEOUT`) is dropped and shows up in
+    `Analysis.dropped` instead of holding up the front page.
+
+    `budget` is a deadline in seconds from the start of the call. Building
+    the profile (when none is passed), fingerprinting and drawing the
+    sample count against it but always run to completion; the detectors
+    and the verification of sampled findings are cut off when it passes.
+    Detectors still running then are dropped like timeouts (none start
+    once it has passed), and sampled findings not yet verified go out as
+    estimates (the result is marked `partial`). `progress` is called with
+    a partial `Analysis` (the best findings so far) each time a detector
+    finishes or a sampled finding is verified, from the calling thread.
 
+    With `sample_rows`, frames longer than that are screened on a stratified
+    sample of that many rows; the best `verify_top` candidates (default
+    `limit`) are then recomputed exactly on the full frame. Every finding's
+    evidence says which numbers it carries under ``computed_on``.
+
+    `instrument` runs the detectors one at a time and fills in each
+    `DetectorRun`'s rows/columns scanned, candidate count, memory peak and
+    traceback; see `Analysis.diagnostics()`. It bypasses the result memo,
+    the budget and progress reports.
+    """
+    if profile is None and (df is None or df.empty):
+        return Analysis([])
+    deadline = None if budget is None else time.perf_counter() + budget
+    key = data_key = None
+    if df is not None:
+        sampled = bool(sample_rows and len(df) > sample_rows)
+        if profile is None and not sampled:
+            profile = DatasetProfile.from_frame(df)
+        if profile is not None and profile.fingerprints:
+            fps = tuple(profile.fingerprints.items())
+        else:
+            # sampled findings are verified on every row, so the key must
+            # cover every row too, not just the sampled ones
+            fps = tuple((c, column_fingerprint(df[c])) for c in df.columns)
+        data_key = (fps, QUANTILE_MODE)
+        key = ("analysis", fps, limit, sample_rows,
+               verify_top, tuple(DETECTORS), QUANTILE_MODE)
+        hit = None if instrument else MEMO.get(key)
+        if hit is not None:
+            return copy.deepcopy(hit)
+    if sample_rows and df is not None and len(df) > sample_rows:
+        result = _sample_then_verify(df, limit, sample_rows,
+                                     verify_top or limit, deadline, progress,
+                                     executor=executor,
+                                     max_workers=max_workers, timeout=timeout,
+                                     instrument=instrument)
+    else:
+        result = _run_all(df, limit, profile, executor, max_workers, timeout,
+                          instrument, deadline, progress, data_key)
+    # a timeout says nothing about the data, so don't remember it
+    if key is not None and not result.dropped and not result.partial:
+        MEMO.put(key, copy.deepcopy(result))
+    return result
+
+
+def _run_all(df, limit, profile, executor, max_workers, timeout,
+             instrument=False, deadline=None, progress=None,
+             key=None) -> Analysis:
+    prof = _profile(df, profile)
+    if prof.n_rows == 0 or prof.n_cols == 0:
+        return Analysis([])
+
+    if instrument:
+        results, runs = _run_instrumented(df, prof, DETECTORS)
+    else:
+        so_far: list[Finding] = []
+        finished: list[DetectorRun] = []
+
+        def done_cb(found, run):
+            so_far.extend(found)
+            finished.append(run)
+            if progress is not None:
+                progress(Analysis(_rank(so_far, limit), list(finished),
+                                  partial=True))
+
+        results, runs = _schedule(
+            df, prof, DETECTORS, executor or EXECUTOR,
+            max_workers or MAX_WORKERS,
+            timeout if timeout is not None else DETECTOR_TIMEOUT,
+            deadline, done_cb, key)
+    findings: list[Finding] = []
+    for found, run in zip(results, runs):
+        run.n_findings = len(found)
+        findings.extend(found)
+    return Analysis(_rank(findings, limit), runs)
+
+
+def _rank(findings: list[Finding], limit: Optional[int]) -> list[Finding]:
     # dedupe identical headlines, keeping the highest-scoring instance
     best: dict[str, Finding] = {}
     for f in findings:
@@ -402,3 +1944,610 @@ def analyze(df: pd.DataFrame, limit: int = 8) -> list[Finding]:
 
     ranked = sorted(best.values(), key=lambda f: f.rank_score, reverse=True)
     return ranked[:limit]
+
+
+# --------------------------------------------------------------------------- #
+# Sample-then-verify: screen on a sample, recompute the winners exactly
+# --------------------------------------------------------------------------- #
+# every stratum keeps at least this many rows, so rare groups still clear
+# the detectors' minimum group sizes
+STRATUM_MIN = 30
+# `stratified_sample()` seed for sample-then-verify runs
+SAMPLE_SEED = 0
+# rows looked at to choose the stratification column
+PROBE_ROWS = 10_000
+
+# detector that produced each finding kind, and the evidence keys naming
+# the columns it was computed from
+_KIND_SOURCE = {
+    "correlation": (detect_correlations, ("x", "y")),
+    "segment_difference": (detect_segment_differences,
+                           ("group_col", "value_col")),
+    "imbalance": (detect_imbalance, ("column",)),
+    "outliers": (detect_outliers, ("column",)),
+    "missingness_pattern": (detect_missingness, ("missing_col", "group_col")),
+    "missingness": (detect_missingness, ("column",)),
+    "hygiene": (detect_hygiene, ("column",)),
+    "duplicates": (detect_hygiene, ()),
+    "near_duplicates": (detect_hygiene, ()),
+}
+
+
+def stratified_sample(df: pd.DataFrame, n_rows: int,
+                      seed: int = 0) -> pd.DataFrame:
+    """About `n_rows` rows of `df`, stratified on its most lopsided grouping.
+
+    The grouping column is picked from a small uniform probe; every one of
+    its groups (missing included) keeps at least `STRATUM_MIN` rows and the
+    rest are allocated proportionally. Row order is preserved.
+    """
+    if len(df) <= n_rows:
+        return df
+    rng = np.random.default_rng(seed)
+    probe = df.iloc[np.sort(rng.choice(len(df), min(len(df), PROBE_ROWS),
+                                       replace=False))]
+    pprof = DatasetProfile.from_frame(probe)
+    cats = pprof.categorical(max_card=8)
+    if not cats:
+        return df.iloc[np.sort(rng.choice(len(df), n_rows, replace=False))]
+    strat = min(cats, key=lambda c: pprof.value_counts(c).iloc[-1])
+    codes, _ = pd.factorize(df[strat])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    picks = []
+    for rows in np.split(order, bounds):
+        want = max(round(n_rows * len(rows) / len(df)), STRATUM_MIN)
+        picks.append(rows if want >= len(rows) else
+                     rng.choice(rows, want, replace=False))
+    return df.iloc[np.sort(np.concatenate(picks))]
+
+
+def _verify(df: pd.DataFrame, f: Finding) -> Optional[Finding]:
+    """Recompute `f` exactly on the full frame, or None if it doesn't hold.
+
+    The source detector is rerun on just the columns the finding is about,
+    which yields the same numbers as a full run at a fraction of the cost.
+    """
+    det, keys = _KIND_SOURCE[f.kind]
+    cols = [f.evidence[k] for k in keys]
+    found = det(df[cols] if cols else df)
+    return next((g for g in found if g.kind == f.kind
+                 and [g.evidence[k] for k in keys] == cols), None)
+
+
+def _sample_then_verify(df, limit, sample_rows, verify_top, deadline=None,
+                        progress=None, **schedule):
+    sample = stratified_sample(df, sample_rows, SAMPLE_SEED)
+
+    def edition(exact, estimated, runs, partial=True):
+        # copies: the screened findings may be sitting in the memo
+        on_sample = f"{len(sample):,}-row sample (estimated)"
+        estimated = [replace(f, evidence={**f.evidence,
+                                          "computed_on": on_sample})
+                     for f in estimated]
+        return Analysis(_rank(exact + estimated, limit), runs,
+                        sample_rows=len(sample), partial=partial)
+
+    report = None
+    if progress is not None:
+        def report(a):
+            progress(edition([], a.findings, a.runs))
+    screened = run_analysis(
+        sample, limit=None, progress=report,
+        **schedule,
+        budget=None if deadline is None else
+        max(deadline - time.perf_counter(), 0))
+    top, exact = screened.findings[:verify_top], []
+    # under a deadline each check runs on a thread that is abandoned,
+    # like a late detector, if the deadline passes first
+    verifier = None if deadline is None else ThreadPoolExecutor(max_workers=1)
+    try:
+        for n, f in enumerate(top):
+            g = _verify(df, f) if verifier is None else \
+                _verify_until(verifier, df, f, deadline)
+            if g is _LATE:
+                # out of time: the rest go out as sample estimates
+                return edition(exact, top[n:]
+                               + screened.findings[verify_top:],
+                               screened.runs)
+            if g is not None:
+                g.evidence["computed_on"] = f"all {len(df):,} rows (exact)"
+                exact.append(g)
+            if progress is not None and n + 1 < len(top):
+                progress(edition(exact, top[n + 1:]
+                                 + screened.findings[verify_top:],
+                                 screened.runs))
+    finally:
+        if verifier is not None:
+            verifier.shutdown(wait=False, cancel_futures=True)
+    return edition(exact, screened.findings[verify_top:], screened.runs,
+                   partial=False)
+
+
+_LATE = object()
+
+
+def _verify_until(pool, df, f, deadline):
+    """`_verify()` on `pool`, or `_LATE` if `deadline` passes first."""
+    left = deadline - time.perf_counter()
+    if left <= 0:
+        return _LATE
+    fut = pool.submit(_verify, df, f)
+    done, _ = wait([fut], timeout=left)
+    return fut.result() if done else _LATE
+
+
+def analyze(df: pd.DataFrame, limit: int = 8,
+            profile: Optional[DatasetProfile] = None,
+            **schedule) -> list[Finding]:
+    """Run all detectors, dedupe, and return the most interesting findings.
+
+    Every detector reads the same `DatasetProfile`, so column types,
+    cardinalities and null counts are computed once per call (or not at all
+    when the caller already has a profile). Scheduling options are passed
+    through to `run_analysis()`.
+    """
+    return run_analysis(df, limit, profile, **schedule).findings
+
+
+# --------------------------------------------------------------------------- #
+# Out-of-core analysis: mergeable statistics, one chunk at a time
+# --------------------------------------------------------------------------- #
+# distinct values tracked per column before it is ruled out as a grouping;
+# covers the largest `max_card` any detector asks for
+STREAM_MAX_CARD = 12
+# groupings up to this many values also carry per-group statistics
+STREAM_GROUP_CARD = 8
+# distinct values kept per numeric column for exact quartiles; columns with
+# more fall back to their `QuantileSketch`
+STREAM_QUANTILE_VALUES = 100_000
+
+
+class _HashSet:
+    """Append-only set of 64-bit hashes stored as a few sorted runs.
+
+    A new run is merged into its predecessor once it reaches half its size
+    (log-structured), so adding a batch costs about O(batch · log n) and the
+    set takes 8 bytes per distinct entry.
+    """
+
+    def __init__(self):
+        self._runs: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._runs)
+
+    def contains(self, h: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(h), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, h), len(run) - 1)
+            found |= run[pos] == h
+        return found
+
+    def add(self, h: np.ndarray) -> int:
+        """Insert `h`; returns how many distinct values were new."""
+        h = np.unique(h)
+        new = h[~self.contains(h)]
+        if len(new):
+            self._runs.append(new)
+            while (len(self._runs) > 1
+                   and 2 * len(self._runs[-1]) >= len(self._runs[-2])):
+                b, a = self._runs.pop(), self._runs.pop()
+                self._runs.append(np.sort(np.concatenate([a, b]),
+                                          kind="mergesort"))
+        return len(new)
+
+
+def _sorted_labels(labels) -> pd.Index:
+    try:
+        return pd.Index(sorted(labels))
+    except TypeError:  # mixed, unorderable labels
+        return pd.Index(list(labels))
+
+
+class StreamAnalyzer:
+    """Mergeable per-detector statistics for data that arrives in chunks.
+
+    Feed it frames with `update()` (e.g. ``pd.read_csv(path, chunksize=…)``);
+    `profile()` then returns a `StreamProfile` that every detector runs on,
+    so the findings match `analyze()` on the whole file while only one chunk
+    is ever in memory. What is kept: co-moments of the numeric columns (for
+    correlations and column moments), per-group moments and null counts for
+    low-cardinality columns (segments, missingness), capped value counts
+    (imbalance, constant columns, quartiles), quantile sketches of the
+    numeric columns (quartiles once the value counts grow too long) and
+    64-bit hashes of rows and of candidate ID columns (duplicates,
+    identifiers).
+
+    Column kinds are fixed by the first chunk. When a later chunk delivers a
+    numeric column as text it is coerced (unparseable values become missing)
+    and the column is listed in `coerced`.
+
+    It doubles as an incremental analyzer for append-only data: keep it
+    around, `update()` it with each new batch and call `refresh()`. The cost
+    of both follows the batch and the number of columns and groups, not the
+    rows seen before.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.columns: list[str] = []
+        self.kinds: dict[str, str] = {}
+        self.coerced: set[str] = set()
+
+    def _start(self, chunk: pd.DataFrame) -> None:
+        self.columns = list(chunk.columns)
+        for c in self.columns:
+            s = chunk[c]
+            self.kinds[c] = ("categorical" if _is_categorical_like(s) else
+                             "numeric" if pd.api.types.is_numeric_dtype(s) else
+                             "datetime")
+        self.num = [c for c in self.columns if self.kinds[c] == "numeric"]
+        p = len(self.num)
+        means = chunk[self.num].mean() if p else pd.Series(dtype=float)
+        self.shift = np.nan_to_num(means.to_numpy(dtype=float))
+        # pairwise co-moments of the shifted numeric columns; [i, j] covers
+        # the rows where both i and j are present
+        self.n_pair = np.zeros((p, p))
+        self.s_pair = np.zeros((p, p))    # sum of x_i
+        self.sq_pair = np.zeros((p, p))   # sum of x_i²
+        self.xy_pair = np.zeros((p, p))   # sum of x_i·x_j
+        self.count = dict.fromkeys(self.columns, 0)
+        self.is_float = dict.fromkeys(self.columns, False)
+        self.values: dict[str, Optional[dict]] = {c: {} for c in self.columns}
+        self.ids: dict[str, Optional[_HashSet]] = {c: _HashSet()
+                                                   for c in self.columns}
+        self.quant: dict[str, Optional[pd.Series]] = {
+            c: pd.Series(dtype=float) for c in self.num}
+        self.sketch = {c: QuantileSketch() for c in self.num}
+        # label -> [size, nulls per column, count, sum, sumsq per numeric]
+        self.groups: dict[str, Optional[dict]] = {
+            c: {} for c in self.columns if self.kinds[c] == "categorical"}
+        self._rows = _HashSet()
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk of rows into the running statistics."""
+        if not self.columns:
+            self._start(chunk)
+        elif list(chunk.columns) != self.columns:
+            raise ValueError("every chunk must have the same columns")
+        if chunk.empty:
+            return
+        for c in self.num:
+            if not pd.api.types.is_numeric_dtype(chunk[c]):
+                chunk = chunk.assign(**{c: pd.to_numeric(chunk[c],
+                                                         errors="coerce")})
+                self.coerced.add(c)
+        self.n_rows += len(chunk)
+        for c in self.columns:
+            self._update_column(c, chunk[c])
+
+        x = chunk[self.num].to_numpy(dtype=float, na_value=np.nan) - self.shift
+        ok = ~np.isnan(x)
+        x[~ok] = 0.0
+        ok = ok.astype(float)
+        self.n_pair += ok.T @ ok
+        self.s_pair += x.T @ ok
+        self.sq_pair += (x * x).T @ ok
+        self.xy_pair += x.T @ x
+
+        nulls = chunk.isna().to_numpy(dtype=float)
+        for c, groups in self.groups.items():
+            if groups is not None:
+                self._update_groups(c, chunk[c], nulls, x, ok)
+
+        norm = chunk.astype({c: float if c in self.quant else object
+                             for c in self.columns
+                             if self.kinds[c] != "datetime"})
+        self._rows.add(pd.util.hash_pandas_object(norm, index=False)
+                       .to_numpy())
+
+    def _update_column(self, c: str, s: pd.Series) -> None:
+        count = int(s.count())
+        self.count[c] += count
+        if pd.api.types.is_float_dtype(s):
+            self.is_float[c] = True
+        vc = None
+        vals = self.values[c]
+        if vals is not None:
+            vc = s.value_counts(sort=False)
+            if len(vc) > STREAM_MAX_CARD:
+                self.values[c] = vals = None
+            else:
+                for k, v in vc.items():
+                    vals[k] = vals.get(k, 0) + int(v)
+                if len(vals) > STREAM_MAX_CARD:
+                    self.values[c] = None
+        if self.quant.get(c) is not None:
+            vc = s.value_counts(sort=False) if vc is None else vc
+            t = self.quant[c].add(vc, fill_value=0) if len(self.quant[c]) else vc
+            self.quant[c] = t if len(t) <= STREAM_QUANTILE_VALUES else None
+        if c in self.sketch:
+            self.sketch[c].update(s.to_numpy(dtype=float, na_value=np.nan))
+        ids = self.ids[c]
+        if ids is not None:
+            # an identifier is never missing, never float and never repeats
+            if count < len(s) or self.is_float[c]:
+                self.ids[c] = None
+            else:
+                h = pd.util.hash_pandas_object(s, index=False).to_numpy()
+                if ids.add(h) < len(h):
+                    self.ids[c] = None
+
+    def _update_groups(self, c, s, nulls, x, ok) -> None:
+        codes, labels = pd.factorize(s)
+        groups = self.groups[c]
+        if len(labels) > STREAM_GROUP_CARD:
+            self.groups[c] = None
+            return
+        onehot = np.zeros((len(s), len(labels)))
+        present = codes >= 0
+        onehot[np.flatnonzero(present), codes[present]] = 1.0
+        stats = (onehot.sum(axis=0), onehot.T @ nulls, onehot.T @ ok,
+                 onehot.T @ x, onehot.T @ (x * x))
+        for g, label in enumerate(labels):
+            new = [a[g] for a in stats]
+            if label in groups:
+                groups[label] = [a + b for a, b in zip(groups[label], new)]
+            else:
+                groups[label] = new
+        if len(groups) > STREAM_GROUP_CARD:
+            self.groups[c] = None
+
+    def profile(self) -> "StreamProfile":
+        """A detector-ready view of everything seen so far."""
+        cols = {}
+        for i, c in enumerate(self.columns):
+            vals, ids = self.values[c], self.ids[c]
+            if vals is not None:
+                nun, bound = len(vals), False
+            elif ids is not None:
+                nun, bound = len(ids), False
+            else:
+                nun, bound = STREAM_MAX_CARD + 1, True
+            prof = ColumnProfile(c, self.kinds[c], self.count[c],
+                                 self.n_rows - self.count[c], nun,
+                                 n_unique_is_bound=bound,
+                                 is_float=self.is_float[c])
+            if prof.kind == "numeric":
+                j = self.num.index(c)
+                n, s1, s2 = (self.n_pair[j, j], self.s_pair[j, j],
+                             self.sq_pair[j, j])
+                if n:
+                    prof.mean = s1 / n + self.shift[j]
+                if n > 1:
+                    prof.std = float(np.sqrt(max(s2 - s1 * s1 / n, 0.0)
+                                             / (n - 1)))
+            elif prof.kind == "categorical" and vals is not None:
+                prof.uniques = _sorted_labels(vals)
+            cols[c] = prof
+        return StreamProfile(n_rows=self.n_rows, columns=cols,
+                             n_duplicates=self.n_rows - len(self._rows),
+                             stream=self)
+
+    def refresh(self, limit: int = 8, **schedule) -> Analysis:
+        """Ranked findings over every row folded in so far."""
+        return run_analysis(None, limit, profile=self.profile(), **schedule)
+
+
+@dataclass
+class StreamProfile(DatasetProfile):
+    """`DatasetProfile` whose statistics come from a `StreamAnalyzer`."""
+
+    stream: Optional[StreamAnalyzer] = field(default=None, repr=False,
+                                             compare=False)
+
+    def value_counts(self, col: str) -> pd.Series:
+        # dict order is first appearance, so ties break like value_counts
+        vc = pd.Series(self.stream.values[col], name="count")
+        return vc.sort_values(ascending=False, kind="stable")
+
+    def _group_stats(self, c: str) -> list[list]:
+        groups = self.stream.groups[c]
+        return [groups[label] for label in self.columns[c].uniques]
+
+    def group_moments(self, cats, cols):
+        idx = [self.stream.num.index(n) for n in cols]
+        out = {}
+        for c in cats:
+            stats = self._group_stats(c)
+            out[c] = tuple(np.array([g[k][idx] for g in stats])
+                           for k in (2, 3, 4))
+        return out, self.stream.shift[idx]
+
+    def group_null_counts(self, cats, cols):
+        idx = [self.stream.columns.index(m) for m in cols]
+        stats = [g for c in cats for g in self._group_stats(c)]
+        sizes = np.array([g[0] for g in stats])
+        nulls = np.array([g[1][idx] for g in stats]).reshape(len(stats),
+                                                              len(idx))
+        return sizes, nulls
+
+    def corr_counts(self, cols, method="pearson"):
+        if method != "pearson":
+            raise ValueError("streams only keep Pearson co-moments")
+        st = self.stream
+        idx = [st.num.index(c) for c in cols]
+        ix = np.ix_(idx, idx)
+        n, sa, saa, sab = (st.n_pair[ix], st.s_pair[ix], st.sq_pair[ix],
+                           st.xy_pair[ix])
+        r = _corr_from_moments(n, sa, saa, sa.T, saa.T, sab)
+        return pd.DataFrame(r, index=cols, columns=cols), n
+
+    def pair_count(self, a, b):
+        st = self.stream
+        return int(st.n_pair[st.num.index(a), st.num.index(b)])
+
+    def _table(self, col) -> Optional[pd.Series]:
+        t = self.stream.quant.get(col)
+        return None if t is None else t.sort_index()
+
+    def value_range(self, col):
+        t = self._table(col)
+        if t is None or t.empty:  # sketches don't keep the extremes
+            return None
+        return float(t.index.min()), float(t.index.max())
+
+    def quartiles(self, cols):
+        out = {}
+        for c in cols:
+            t = self._table(c)
+            if t is None:
+                q = self.stream.sketch[c].quantiles(BOX_QUANTILES)
+                out[c] = None if q is None else tuple(q)
+            elif t.empty:
+                out[c] = None
+            else:
+                values, cum = t.index.to_numpy(dtype=float), np.cumsum(t.to_numpy())
+                out[c] = tuple(_lerp_quantile(values, cum, q)
+                               for q in BOX_QUANTILES)
+        return out
+
+    def quartile_error(self, col):
+        if self._table(col) is None:
+            return self.stream.sketch[col].rank_error
+        return 0.0
+
+    def count_outside(self, col, lo, hi):
+        t = self._table(col)
+        if t is None:
+            return self.stream.sketch[col].count_outside(lo, hi)
+        return int(t[(t.index < lo) | (t.index > hi)].sum())
+
+
+def analyze_stream(chunks, limit: int = 8, **schedule) -> list[Finding]:
+    """`analyze()` over an iterable of frames, in bounded memory.
+
+    ``analyze_stream(pd.read_csv(path, chunksize=200_000))`` returns the same
+    findings `analyze(pd.read_csv(path))` would. Use `StreamAnalyzer`
+    directly to also get the profile for `dataset_summary()`.
+    """
+    stream = StreamAnalyzer()
+    for chunk in chunks:
+        stream.update(chunk)
+    return analyze(None, limit, profile=stream.profile(), **schedule)
+
+
+# --------------------------------------------------------------------------- #
+# Command line: the same analysis over many files, one JSON line per file
+# --------------------------------------------------------------------------- #
+def _jsonable(x):
+    if isinstance(x, dict):
+        return {str(k): _jsonable(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [_jsonable(v) for v in x]
+    if isinstance(x, np.generic):
+        return x.item()
+    if isinstance(x, float) and not np.isfinite(x):
+        return None
+    if x is None or isinstance(x, (str, int, float, bool)):
+        return x
+    return str(x)
+
+
+def analyze_file(path: str, limit: int = 8, cache: bool = False,
+                 sample_rows: Optional[int] = None,
+                 budget: Optional[float] = None) -> dict:
+    """Read one CSV/Parquet/Feather file and analyze it, as a JSON record.
+
+    Never raises: a file that can't be read or analyzed comes back with
+    ``status == "error"`` and the traceback's last line.
+    """
+    import ingest  # engine users without uploads never need it
+
+    rec: dict[str, Any] = {"file": path, "status": "ok", "seconds": {}}
+    try:
+        t0 = time.perf_counter()
+        read = ingest.read_cached if cache else ingest.read_any
+        df, _ = read(path, path)
+        t1 = time.perf_counter()
+        # one profile for the summary and the analysis (which only
+        # screens a sample of the rows when `sample_rows` applies)
+        profile = DatasetProfile.from_frame(df)
+        rec["summary"] = dataset_summary(df, profile=profile)
+        analysis = run_analysis(df, limit=limit, profile=profile,
+                                sample_rows=sample_rows, budget=budget)
+        t2 = time.perf_counter()
+        rec["seconds"] = {"read": round(t1 - t0, 4),
+                          "analyze": round(t2 - t1, 4)}
+        rec["findings"] = [asdict(f) for f in analysis.findings]
+        rec["dropped"] = [asdict(r) for r in analysis.dropped]
+    except Exception as e:
+        rec["status"] = "error"
+        rec["error"] = traceback.format_exception_only(type(e), e)[-1].strip()
+    return _jsonable(rec)
+
+
+def _expand(patterns: list[str]) -> list[str]:
+    files = []
+    for p in patterns:
+        hits = sorted(glob.glob(p, recursive=True))
+        files.extend(hits if hits else [p])  # a missing file reports its error
+    return list(dict.fromkeys(files))
+
+
+def _init_worker(backend: str) -> None:
+    global BACKEND, EXECUTOR
+    BACKEND = backend
+    # the files already run one per core: a detector pool in every worker
+    # would only oversubscribe them
+    EXECUTOR = "serial"
+    MEMO.max_bytes = BATCH_MEMO_BYTES
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m insight_engine",
+        description="Analyze CSV/Parquet/Feather files and write one JSON "
+                    "line of findings per file.")
+    ap.add_argument("files", nargs="+", help="files or glob patterns")
+    ap.add_argument("-o", "--output", default="-",
+                    help="JSON Lines destination (default: stdout)")
+    ap.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                    help="worker processes, reused across files")
+    ap.add_argument("--limit", type=int, default=8,
+                    help="findings kept per file")
+    ap.add_argument("--sample-rows", type=int, default=None,
+                    help="screen longer files on a sample of this many rows")
+    ap.add_argument("--budget", type=float, default=None,
+                    help="seconds of analysis per file; the best findings "
+                         "by then are written")
+    ap.add_argument("--cache", action="store_true",
+                    help="read through the Arrow frame cache")
+    ap.add_argument("--backend", choices=BACKENDS, default=BACKEND,
+                    help="engine for grouped aggregations "
+                         "(default: $DATALITE_BACKEND or pandas)")
+    args = ap.parse_args(argv)
+
+    files = _expand(args.files)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    n_failed, t0 = 0, time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(files)),
+                                 mp_context=MP_CONTEXT,
+                                 initializer=_init_worker,
+                                 initargs=(args.backend,)) as pool:
+            futures = {pool.submit(analyze_file, f, args.limit, args.cache,
+                                   args.sample_rows, args.budget): f
+                       for f in files}
+            # records are written as files finish, not in input order
+            for fut in as_completed(futures):
+                try:
+                    rec = fut.result()
+                except BrokenProcessPool as e:  # worker died (e.g. OOM-killed)
+                    rec = {"file": futures[fut], "status": "error",
+                           "seconds": {}, "error": f"worker crashed: {e}"}
+                n_failed += rec["status"] != "ok"
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(files) - n_failed}/{len(files)} files analyzed in "
+          f"{time.perf_counter() - t0:.1f}s; {n_failed} failed",
+          file=sys.stderr)
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,12 +16,23 @@ from __future__ import annotations
 
 import base64
 import html
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.colors import LinearSegmentedColormap, LogNorm
+
+from insight_engine import MP_CONTEXT, column_fingerprint
 
 # --- palette ---------------------------------------------------------------- #
 PAPER = "#FAF7F0"
@@ -40,6 +51,7 @@ KIND_META = {
     "imbalance":          ("Imbalance",        "#6E3A6B"),
     "outliers":           ("Outliers",         "#C23B22"),
     "duplicates":         ("Duplicates",       "#9B4B5A"),
+    "near_duplicates":    ("Near duplicates",  "#9B4B5A"),
     "hygiene":            ("Data hygiene",     "#5A5751"),
 }
 
@@ -135,6 +147,9 @@ html, body, .stApp, button, input, textarea, select {{
   margin:0 0 6px; }}
 .detail {{ font-size:12.5px; line-height:1.5; color:var(--mute); margin:0 0 4px; }}
 .chart {{ width:100%; display:block; margin:10px 0 4px; }}
+.chart.pending {{ height:150px; background:var(--line); opacity:.4;
+  border-radius:2px; animation:breathe 1.4s ease-in-out infinite alternate; }}
+.lead .chart.pending {{ height:230px; }}
 .bignum {{ font-family:'Fraunces', serif; font-weight:600; font-size:46px;
   line-height:1.1; margin:8px 0; }}
 
@@ -182,6 +197,9 @@ details.verify[open] summary::before {{ content:"\\2212"; }}
 @keyframes rise {{ from {{ opacity:0; transform:translateY(12px); }}
   to {{ opacity:1; transform:none; }} }}
 @keyframes grow {{ from {{ width:0 !important; }} }}
+@keyframes breathe {{ to {{ opacity:.15; }} }}
+/* re-typeset pages don't replay the entrance */
+.still .lead, .still .card, .still .signal .fill {{ animation:none; }}
 
 /* ---------- streamlit widget restyle ---------- */
 /* DARK sidebar against the light editorial page (high contrast, intentional) */
@@ -220,9 +238,9 @@ h1,h2,h3,h4 {{ color:var(--ink); }}
 # --------------------------------------------------------------------------- #
 # charts
 # --------------------------------------------------------------------------- #
-def _fig_to_b64(fig) -> str:
+def _fig_to_b64(fig, dpi=130) -> str:
     buf = BytesIO()
-    fig.savefig(buf, format="png", transparent=True, bbox_inches="tight", dpi=130)
+    fig.savefig(buf, format="png", transparent=True, bbox_inches="tight", dpi=dpi)
     plt.close(fig)
     buf.seek(0)
     return base64.b64encode(buf.read()).decode()
@@ -241,18 +259,150 @@ def _style_axes(ax):
     ax.figure.patch.set_alpha(0); ax.patch.set_alpha(0)
 
 
-def chart_b64(finding, frame, large=False):
+# Rendered charts are cached under their spec plus the fingerprints of the
+# columns they draw, so Streamlit reruns don't redraw unchanged cards.
+CHART_CACHE_BYTES = 32 * 1024**2
+# misses are drawn on a process pool ("process") or one by one ("serial")
+CHART_EXECUTOR = "process"
+CHART_WORKERS = None
+
+# frame columns each chart type reads; the rest draw from the spec alone
+_CHART_COLUMNS = {"scatter": ("x", "y"), "box": ("col",)}
+
+# above this many rows scatters become 2-D density grids and boxplots are
+# drawn from quantiles, so drawing cost follows the bins, not the rows
+CHART_BIN_ROWS = 20_000
+CHART_BINS = (64, 40)
+CHART_MAX_FLIERS = 400
+
+# How charts reach the browser: "png" embeds full-size base64 PNGs, "thumb"
+# smaller low-dpi PNGs, and "vega" ships Vega-Lite specs drawn client-side
+# (falling back to a thumbnail for charts without a spec).
+CHART_MODE = "png"
+THUMB_SIZE = (3.6, 1.9)
+THUMB_DPI = 72
+VEGA_SCRIPTS = ("https://cdn.jsdelivr.net/npm/vega@5",
+                "https://cdn.jsdelivr.net/npm/vega-lite@5",
+                "https://cdn.jsdelivr.net/npm/vega-embed@6")
+# vega specs carry their data inline, so they switch to bins much earlier
+VEGA_MAX_POINTS = 300
+VEGA_BINS = (32, 20)
+VEGA_MAX_FLIERS = 100
+
+
+class _ChartCache:
+    """Thread-safe LRU of base64 PNGs, bounded by their total length."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            b64 = self._data.get(key)
+            if b64 is not None:
+                self._data.move_to_end(key)
+            return b64
+
+    def put(self, key, b64: str) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = b64
+            self._bytes += len(b64)
+            while self._bytes > self.max_bytes and self._data:
+                self._bytes -= len(self._data.popitem(last=False)[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+CHART_CACHE = _ChartCache(CHART_CACHE_BYTES)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _chart_columns(spec, frame):
+    """Frame columns the chart reads, or None if `frame` lacks any."""
+    cols = [spec.get(k) for k in _CHART_COLUMNS.get(spec.get("type"), ())]
+    if cols and (frame is None or any(c not in frame for c in cols)):
+        return None
+    return cols
+
+
+def _chart_key(finding, frame, large, thumb=False, fingerprints=None):
+    # `fingerprints` (a profile's) spares hashing the columns on every rerun
     spec = finding.chart or {}
+    cols = _chart_columns(spec, frame)
+    if cols is None:
+        return None
+    fingerprints = fingerprints or {}
+    fps = tuple(fingerprints.get(c) or column_fingerprint(frame[c])
+                for c in cols)
+    return (finding.kind, json.dumps(spec, sort_keys=True, default=str),
+            large, thumb, fps)
+
+
+def _chart_data(spec, frame):
+    """The slice of `frame` a chart needs, small enough to ship to a worker."""
+    kind = spec.get("type")
+    if kind == "scatter":
+        sub = frame[[spec["x"], spec["y"]]].dropna()
+        if len(sub) <= CHART_BIN_ROWS:
+            return sub
+        x = sub[spec["x"]].to_numpy(dtype=float)
+        y = sub[spec["y"]].to_numpy(dtype=float)
+        return np.histogram2d(x, y, bins=CHART_BINS)
+    if kind == "box":
+        s = frame[spec["col"]].dropna()
+        return s if len(s) <= CHART_BIN_ROWS else _box_stats(s, spec)
+    return None
+
+
+def _box_stats(s: pd.Series, spec: dict = None) -> dict:
+    """`Axes.bxp` statistics matching `boxplot`'s defaults, with at most
+    `CHART_MAX_FLIERS` fliers. Quartiles already in the chart `spec` (the
+    outlier detector puts them there) are used instead of recomputed."""
+    v = s.to_numpy(dtype=float)
+    if spec and all(k in spec for k in ("q1", "med", "q3")):
+        q1, med, q3 = spec["q1"], spec["med"], spec["q3"]
+    else:
+        q1, med, q3 = np.quantile(v, [.25, .5, .75])
+    lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = (v >= lo) & (v <= hi)
+    fliers = v[~inside]
+    if len(fliers) > CHART_MAX_FLIERS:
+        # always keep the extremes, sample the rest
+        keep = np.random.default_rng(0).choice(len(fliers), CHART_MAX_FLIERS - 2,
+                                               replace=False)
+        fliers = np.concatenate([[fliers.min(), fliers.max()], fliers[keep]])
+    return {"q1": q1, "med": med, "q3": q3,
+            "whislo": v[inside].min() if inside.any() else q1,
+            "whishi": v[inside].max() if inside.any() else q3,
+            "fliers": fliers}
+
+
+def _draw(finding_kind, spec, data, large=False, thumb=False):
     kind = spec.get("type")
     if kind in (None, "metric"):
         return None
-    figsize = (6.4, 2.7) if large else (4.4, 2.35)
+    figsize = THUMB_SIZE if thumb else (6.4, 2.7) if large else (4.4, 2.35)
     fig, ax = plt.subplots(figsize=figsize)
-    accent = KIND_META.get(finding.kind, ("", INK))[1]
+    accent = KIND_META.get(finding_kind, ("", INK))[1]
     try:
-        if kind == "scatter":
-            sub = frame[[spec["x"], spec["y"]]].dropna()
-            ax.scatter(sub[spec["x"]], sub[spec["y"]], s=16, alpha=.55,
+        if kind == "scatter" and isinstance(data, tuple):
+            counts, xe, ye = data
+            cmap = LinearSegmentedColormap.from_list("ink", [CARD, accent])
+            ax.pcolormesh(xe, ye, np.ma.masked_equal(counts.T, 0), cmap=cmap,
+                          norm=LogNorm(vmin=1, vmax=max(counts.max(), 2)))
+            ax.set_xlabel(spec["x"]); ax.set_ylabel(spec["y"])
+        elif kind == "scatter":
+            ax.scatter(data[spec["x"]], data[spec["y"]], s=16, alpha=.55,
                        color=accent, edgecolor="none")
             ax.set_xlabel(spec["x"]); ax.set_ylabel(spec["y"])
         elif kind == "group_bar":
@@ -265,8 +415,10 @@ def chart_b64(finding, frame, large=False):
             ax.bar(list(cc.keys()), list(cc.values()), color=accent, width=.62)
             ax.set_ylabel("count")
         elif kind == "box":
-            bp = ax.boxplot(frame[spec["col"]].dropna(), patch_artist=True,
-                            widths=.45)
+            if isinstance(data, dict):
+                bp = ax.bxp([data], patch_artist=True, widths=.45)
+            else:
+                bp = ax.boxplot(data, patch_artist=True, widths=.45)
             for b in bp["boxes"]:
                 b.set(facecolor=accent, alpha=.22, edgecolor=accent)
             for part in bp["whiskers"] + bp["caps"] + bp["medians"]:
@@ -285,12 +437,247 @@ def chart_b64(finding, frame, large=False):
         if kind in ("group_bar", "value_counts", "missing_by_group"):
             plt.setp(ax.get_xticklabels(), rotation=16, ha="right")
         fig.tight_layout()
-        return _fig_to_b64(fig)
+        return _fig_to_b64(fig, dpi=THUMB_DPI if thumb else 130)
     except Exception:
         plt.close(fig)
         return None
 
 
+def _timed_draw(*args):
+    t0 = time.perf_counter()
+    b64 = _draw(*args)
+    return b64, time.perf_counter() - t0
+
+
+def chart_b64(finding, frame, large=False, timings=None, fingerprints=None):
+    return render_charts([(finding, large)], frame, timings=timings,
+                         fingerprints=fingerprints)[0]
+
+
+def _chart_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=MP_CONTEXT)
+        return _pool
+
+
+def render_charts(jobs, frame, thumb=False, timings=None, fingerprints=None):
+    """Base64 PNGs for ``[(finding, large), ...]``, in order.
+
+    `fingerprints` maps columns of `frame` to their `column_fingerprint()`,
+    as in `DatasetProfile.fingerprints`; columns missing from it are hashed.
+
+    Cached charts come straight back; the rest are drawn side by side on a
+    process pool (`CHART_EXECUTOR`) since Agg rendering is CPU-bound. If
+    `timings` is a list, one ``{"seconds", "cached"}`` per job is appended
+    (seconds spent drawing, 0 for cache hits and charts with no image).
+    """
+    global _pool
+    out, todo = [None] * len(jobs), []
+    spent = [(0.0, False)] * len(jobs)
+    for i, (finding, large) in enumerate(jobs):
+        spec = finding.chart or {}
+        if spec.get("type") in (None, "metric"):
+            continue
+        key = _chart_key(finding, frame, large, thumb, fingerprints)
+        if key is None:
+            continue
+        out[i] = CHART_CACHE.get(key)
+        spent[i] = (0.0, out[i] is not None)
+        if out[i] is None:
+            todo.append((i, key, (finding.kind, spec,
+                                  _chart_data(spec, frame), large, thumb)))
+    drawn = None if todo else []
+    if CHART_EXECUTOR == "process" and len(todo) > 1:
+        workers = CHART_WORKERS or min(len(todo), os.cpu_count() or 1)
+        try:
+            drawn = list(_chart_pool(workers).map(
+                _timed_draw, *zip(*(a for _, _, a in todo))))
+        except BrokenProcessPool:
+            with _pool_lock:
+                _pool = None
+    if drawn is None:
+        drawn = [_timed_draw(*args) for _, _, args in todo]
+
+    for (i, key, _), (b64, seconds) in zip(todo, drawn):
+        if b64 is not None:
+            CHART_CACHE.put(key, b64)
+        out[i], spent[i] = b64, (seconds, False)
+    if timings is not None:
+        timings.extend({"seconds": round(t, 4), "cached": c} for t, c in spent)
+    return out
+
+
+# "Explore" panel: one chart per column, drawn on request and cached under the
+# column's fingerprint. The KDE is smoothed from a fine histogram, so it costs
+# the same for a thousand rows as for a hundred million.
+EXPLORE_BINS = 40
+EXPLORE_KDE_GRID = 512
+EXPLORE_TOP = 15
+
+
+def column_chart_b64(s: pd.Series, fingerprint: str = None,
+                     counts: pd.Series = None) -> str:
+    """Histogram with a KDE for a numeric column, bars of the most common
+    values otherwise. `fingerprint` is the column's `column_fingerprint()`
+    if the caller has it; `counts` its value counts, likewise."""
+    key = ("column", str(s.name), fingerprint or column_fingerprint(s))
+    b64 = CHART_CACHE.get(key)
+    if b64 is not None:
+        return b64
+    numeric = (pd.api.types.is_numeric_dtype(s)
+               and not pd.api.types.is_bool_dtype(s))
+    fig, ax = plt.subplots(figsize=(6, 3))
+    if numeric:
+        v = s.to_numpy(dtype=float)
+        v = v[np.isfinite(v)]
+        if len(v):
+            dens, edges = np.histogram(v, bins=EXPLORE_BINS)
+            ax.stairs(dens, edges, fill=True, color=ACCENT, alpha=.35)
+            ax.stairs(dens, edges, color=ACCENT, linewidth=.8)
+            grid, kde = _binned_kde(v)
+            if grid is not None:
+                ax.plot(grid, kde * len(v) * (edges[1] - edges[0]),
+                        color=ACCENT, linewidth=1.4)
+        ax.set_xlabel(str(s.name)); ax.set_ylabel("count")
+    else:
+        vc = (counts if counts is not None else s.value_counts())
+        vc = vc.iloc[:EXPLORE_TOP][::-1]
+        ax.barh([str(i) for i in vc.index], vc.to_numpy(), color="#2C5478",
+                height=.62)
+        ax.set_xlabel("count")
+    _style_axes(ax)
+    if not numeric:
+        ax.grid(axis="y", visible=False)
+        ax.grid(axis="x", color=LINE, linewidth=.8)
+    fig.tight_layout()
+    b64 = _fig_to_b64(fig)
+    CHART_CACHE.put(key, b64)
+    return b64
+
+
+def _binned_kde(v: np.ndarray):
+    """Gaussian KDE (Scott's bandwidth) of `v` on `EXPLORE_KDE_GRID` points,
+    convolved from a histogram rather than summed over every value."""
+    lo, hi, sd = v.min(), v.max(), v.std()
+    if len(v) < 2 or sd == 0 or lo == hi:
+        return None, None
+    bw = sd * len(v) ** (-1 / 5)
+    lo, hi = lo - 3 * bw, hi + 3 * bw
+    counts, edges = np.histogram(v, bins=EXPLORE_KDE_GRID, range=(lo, hi))
+    step = edges[1] - edges[0]
+    half = min(int(np.ceil(4 * bw / step)), (EXPLORE_KDE_GRID - 1) // 2)
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-.5 * (offsets / bw) ** 2)
+    dens = np.convolve(counts, kernel / kernel.sum(), mode="same")
+    return (edges[:-1] + edges[1:]) / 2, dens / (len(v) * step)
+
+
+def _r(x) -> float:
+    return float(f"{float(x):.4g}")
+
+
+def vega_lite_spec(finding, frame, large=False):
+    """A Vega-Lite spec for the finding's chart, or None if there isn't one.
+
+    Data travels inline, so big scatters are binned and boxplots are sent as
+    their five numbers plus a handful of fliers.
+    """
+    spec = finding.chart or {}
+    kind = spec.get("type")
+    accent = KIND_META.get(finding.kind, ("", INK))[1]
+    out = {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "width": "container", "height": 190 if large else 150,
+        "background": "transparent",
+        "config": {"view": {"stroke": None},
+                   "font": "DM Mono",
+                   "axis": {"labelColor": MUTE, "titleColor": MUTE,
+                            "domainColor": LINE, "gridColor": LINE,
+                            "tickSize": 0, "labelFontSize": 9,
+                            "titleFontSize": 9, "titleFontWeight": 400}},
+    }
+    bars = {"group_bar": ("means", spec.get("value"), 1),
+            "value_counts": ("counts", "count", 1),
+            "missing_by_group": ("rates", "% missing", 100)}
+    if kind in bars:
+        field_, title, scale = bars[kind]
+        items = list(spec[field_].items())
+        if kind == "value_counts":
+            items = sorted(items, key=lambda kv: kv[1], reverse=True)[:8]
+        out["data"] = {"values": [{"k": str(k), "v": _r(v * scale)}
+                                  for k, v in items]}
+        out["mark"] = {"type": "bar", "color": accent}
+        out["encoding"] = {
+            "x": {"field": "k", "type": "nominal", "sort": None, "title": None,
+                  "axis": {"labelAngle": -16, "grid": False}},
+            "y": {"field": "v", "type": "quantitative", "title": title}}
+        return out
+    if kind not in _CHART_COLUMNS or _chart_columns(spec, frame) is None:
+        return None
+
+    if kind == "scatter":
+        x, y = spec["x"], spec["y"]
+        sub = frame[[x, y]].dropna()
+        if len(sub) <= VEGA_MAX_POINTS:
+            out["data"] = {"values": [{"x": _r(a), "y": _r(b)}
+                                      for a, b in sub.to_numpy(dtype=float)]}
+            out["mark"] = {"type": "circle", "size": 16, "opacity": .55,
+                           "color": accent}
+            out["encoding"] = {
+                "x": {"field": "x", "type": "quantitative", "title": x,
+                      "scale": {"zero": False}},
+                "y": {"field": "y", "type": "quantitative", "title": y,
+                      "scale": {"zero": False}}}
+            return out
+        counts, xe, ye = np.histogram2d(sub[x].to_numpy(dtype=float),
+                                        sub[y].to_numpy(dtype=float),
+                                        bins=VEGA_BINS)
+        i, j = np.nonzero(counts)
+        dx, dy = xe[1] - xe[0], ye[1] - ye[0]
+        out["data"] = {"values": [{"i": int(a), "j": int(b),
+                                   "n": int(counts[a, b])}
+                                  for a, b in zip(i, j)]}
+        # cell edges are rebuilt from indices to keep the payload small
+        out["transform"] = [
+            {"calculate": f"{_r(xe[0])} + datum.i * {dx!r}", "as": "x"},
+            {"calculate": f"datum.x + {dx!r}", "as": "x2"},
+            {"calculate": f"{_r(ye[0])} + datum.j * {dy!r}", "as": "y"},
+            {"calculate": f"datum.y + {dy!r}", "as": "y2"}]
+        out["mark"] = {"type": "rect"}
+        out["encoding"] = {
+            "x": {"field": "x", "type": "quantitative", "title": x,
+                  "scale": {"zero": False}},
+            "x2": {"field": "x2"},
+            "y": {"field": "y", "type": "quantitative", "title": y,
+                  "scale": {"zero": False}},
+            "y2": {"field": "y2"},
+            "color": {"field": "n", "type": "quantitative", "legend": None,
+                      "scale": {"type": "log", "range": [CARD, accent]}}}
+        return out
+
+    stats = _box_stats(frame[spec["col"]].dropna(), spec)
+    fliers = stats["fliers"][:VEGA_MAX_FLIERS]
+    box = {k: _r(stats[k]) for k in ("q1", "med", "q3", "whislo", "whishi")}
+    y = {"type": "quantitative", "title": spec["col"]}
+    out["data"] = {"values": [box]}
+    out["layer"] = [
+        {"mark": {"type": "rule", "color": accent},
+         "encoding": {"y": {"field": "whislo", **y}, "y2": {"field": "whishi"}}},
+        {"mark": {"type": "bar", "size": 40, "color": accent, "opacity": .22,
+                  "stroke": accent},
+         "encoding": {"y": {"field": "q1", **y}, "y2": {"field": "q3"}}},
+        {"mark": {"type": "tick", "size": 40, "color": accent},
+         "encoding": {"y": {"field": "med", **y}}},
+        {"data": {"values": [{"v": _r(v)} for v in fliers]},
+         "mark": {"type": "point", "size": 10, "color": accent, "opacity": .5},
+         "encoding": {"y": {"field": "v", **y}}},
+    ]
+    return out
+
+
 # --------------------------------------------------------------------------- #
 # html builders
 # --------------------------------------------------------------------------- #
@@ -312,16 +699,20 @@ def _verify(finding) -> str:
             f"<div class='evid'>{rows}</div></details>")
 
 
-def _chart_block(finding, frame, large=False) -> str:
+def _chart_block(finding, frame, large=False, b64=None) -> str:
     spec = finding.chart or {}
     if spec.get("type") == "metric":
         accent = KIND_META.get(finding.kind, ("", INK))[1]
         return f"<div class='bignum' style='color:{accent}'>{_e(spec['value'])}</div>"
-    b64 = chart_b64(finding, frame, large=large)
+    if b64 is None:
+        b64 = chart_b64(finding, frame, large=large)
     return f"<img class='chart' src='data:image/png;base64,{b64}'/>" if b64 else ""
 
 
-def card_html(finding, frame, lead=False) -> str:
+def card_html(finding, frame, lead=False, chart=None) -> str:
+    # `chart` is the ready chart element; drawn here when not given
+    if chart is None:
+        chart = _chart_block(finding, frame, large=lead)
     label, accent = KIND_META.get(finding.kind, (finding.kind, INK))
     detail = f"<p class='detail'>{_e(finding.detail)}</p>" if finding.detail else ""
     head = (f"<div class='kicker'>{_e(label)}</div>"
@@ -330,10 +721,9 @@ def card_html(finding, frame, lead=False) -> str:
         return (f"<article class='lead' style='--accent:{accent}'>"
                 f"<div class='textcol'>{head}{_signal(finding.score)}"
                 f"{_verify(finding)}</div>"
-                f"<div class='chartcol'>{_chart_block(finding, frame, large=True)}"
-                f"</div></article>")
+                f"<div class='chartcol'>{chart}</div></article>")
     return (f"<article class='card' style='--accent:{accent}'>{head}"
-            f"{_chart_block(finding, frame)}{_signal(finding.score)}"
+            f"{chart}{_signal(finding.score)}"
             f"{_verify(finding)}</article>")
 
 
@@ -361,15 +751,101 @@ def chips_html(summary: dict) -> str:
     return f"<div class='chips'>{inner}</div>"
 
 
-def insights_html(findings, frame) -> str:
+def _vega_json(value) -> str:
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
+
+def _vega_html(specs: dict) -> str:
+    scripts = "".join(f"<script src='{u}'></script>" for u in VEGA_SCRIPTS)
+    payload = _vega_json(specs)
+    return (f"{scripts}<script>const S={payload};for(const id in S)"
+            "vegaEmbed('#'+id,S[id],{actions:false,renderer:'svg'});</script>")
+
+
+PENDING_CHART = "<div class='chart pending'></div>"
+
+
+def insights_html(findings, frame, mode=None, payload=None, pending=False,
+                  animate=True, fingerprints=None) -> str:
+    """The front-page stories as one HTML block.
+
+    `mode` overrides `CHART_MODE`. If `payload` is a list, one
+    ``{"headline", "kind", "mode", "bytes", "render_seconds", "cached"}``
+    entry per card is appended to it; in "vega" mode the shared script tag
+    is reported under ``None`` and each card's own spec counts toward the
+    card.
+
+    With `pending`, nothing is drawn: charts already in `CHART_CACHE` are
+    used and the rest left as placeholders, so a page can be typeset while
+    the analysis is still running. `animate=False` skips the entrance
+    animation, for pages that replace an earlier version of themselves.
+    `fingerprints` is passed on to `render_charts()`.
+    """
     if not findings:
+        if pending:
+            return ("<div class='quiet'>Reading the data — the first stories "
+                    "are on their way.</div>")
         return ("<div class='quiet'>A quiet edition — no strong patterns made "
                 "the front page today. Explore the data yourself below.</div>")
-    lead = card_html(findings[0], frame, lead=True)
-    if len(findings) > 1:
-        rest = "".join(card_html(f, frame) for f in findings[1:])
-        body = f"<div class='grid'>{rest}</div>"
+    mode = mode or CHART_MODE
+    jobs = [(f, i == 0) for i, f in enumerate(findings)]
+    charts, modes, specs = [None] * len(jobs), [mode] * len(jobs), {}
+    spent = [{"seconds": 0.0, "cached": False}] * len(jobs)
+    if pending:
+        for i, (f, large) in enumerate(jobs):
+            drawn = (f.chart or {}).get("type") not in (None, "metric")
+            key = (_chart_key(f, frame, large, mode == "thumb", fingerprints)
+                   if drawn else None)
+            b64 = CHART_CACHE.get(key) if key is not None else None
+            charts[i] = (PENDING_CHART if key is not None and b64 is None
+                         else _chart_block(f, frame, large=large,
+                                           b64=b64 or ""))
+    elif mode == "vega":
+        for i, (f, large) in enumerate(jobs):
+            spec = vega_lite_spec(f, frame, large=large)
+            if spec is not None:
+                specs[f"vl{i}"] = spec
+                charts[i] = f"<div class='chart' id='vl{i}'></div>"
+            elif (f.chart or {}).get("type") not in (None, "metric"):
+                modes[i] = "thumb"
+    raster = [] if pending else [i for i in range(len(jobs))
+                                 if charts[i] is None]
+    for thumb in (False, True):
+        idx = [i for i in raster if (modes[i] == "thumb") == thumb]
+        timings = []
+        drawn = render_charts([jobs[i] for i in idx], frame, thumb=thumb,
+                              timings=timings, fingerprints=fingerprints)
+        for i, b64, t in zip(idx, drawn, timings):
+            charts[i] = _chart_block(jobs[i][0], frame, large=jobs[i][1],
+                                     b64=b64 or "")
+            spent[i] = t
+
+    cards = [card_html(f, frame, lead=large, chart=c)
+             for (f, large), c in zip(jobs, charts)]
+    if payload is not None:
+        for i, (f, card, m, t) in enumerate(zip(findings, cards, modes,
+                                                spent)):
+            spec = specs.get(f"vl{i}")
+            # a spec ships in the shared script as `"vl<i>":{...},`
+            extra = (len(_vega_json({f"vl{i}": spec}).encode()) - 1
+                     if spec is not None else 0)
+            payload.append({"headline": f.headline, "kind": f.kind,
+                            "mode": m, "bytes": len(card.encode()) + extra,
+                            "render_seconds": t["seconds"],
+                            "cached": t["cached"]})
+    lead = cards[0]
+    if len(cards) > 1:
+        body = f"<div class='grid'>{''.join(cards[1:])}</div>"
     else:
         body = ""
     head = "<div class='section-h'>The findings</div>"
-    return f"{lead}{head}{body}"
+    tail = _vega_html(specs) if specs else ""
+    if payload is not None and tail:
+        shared = len(tail.encode()) - sum(
+            len(_vega_json({k: v}).encode()) - 1 for k, v in specs.items())
+        payload.append({"headline": None, "kind": None, "mode": "vega",
+                        "bytes": shared, "render_seconds": 0.0,
+                        "cached": False})
+    if not animate:
+        return f"<div class='still'>{lead}{head}{body}</div>{tail}"
+    return f"{lead}{head}{body}{tail}"
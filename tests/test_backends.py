@@ -0,0 +1,42 @@
+"""Every grouping backend must give the pandas backend's findings."""
+
+from dataclasses import astuple
+
+import pytest
+
+import insight_engine as ie
+from bench import make_dataset
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df, _ = make_dataset(4000, n_cols=16, card=6, seed=3)
+    return df
+
+
+def _rounded(x):
+    # group sums are added up in a different order by each engine, so raw
+    # floats may differ in the last bits; everything shown must not
+    if isinstance(x, float):
+        return float(f"{x:.9g}")
+    if isinstance(x, dict):
+        return {k: _rounded(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return type(x)(_rounded(v) for v in x)
+    return x
+
+
+def _findings(df, backend, monkeypatch):
+    monkeypatch.setattr(ie, "BACKEND", backend)
+    ie.MEMO.clear()  # memoized group statistics would hide the backend
+    return [_rounded(astuple(f))
+            for f in ie.run_analysis(df, limit=None).findings]
+
+
+@pytest.mark.parametrize("backend", [b for b in ie.BACKENDS if b != "pandas"])
+def test_same_findings_as_pandas(frame, backend, monkeypatch):
+    pytest.importorskip(backend)
+    want = _findings(frame, "pandas", monkeypatch)
+    got = _findings(frame, backend, monkeypatch)
+    assert want  # the planted effects are found at all
+    assert got == want
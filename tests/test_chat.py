@@ -0,0 +1,78 @@
+"""ChatClient against a local server-sent-events stub."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from chat import ChatClient, ChatError
+
+PIECES = ["The ", "median ", "is ", "42."]
+
+
+class _Stub(BaseHTTPRequestHandler):
+    # set per test through the server: reply status and request log
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": "rate limited"}')
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for piece in PIECES:
+            event = {"choices": [{"delta": {"content": piece}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    srv.requests, srv.status = [], 200
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def client(server):
+    c = ChatClient("test-key", base_url=f"http://127.0.0.1:{server.server_port}/")
+    yield c
+    c.close()
+
+
+def test_streams_pieces_in_order(server, client):
+    assert list(client.stream("median?", dataset="fp")) == PIECES
+    assert server.requests[0]["stream"] is True
+    assert server.requests[0]["messages"][0]["content"] == "median?"
+
+
+def test_repeat_question_is_a_cache_hit(server, client):
+    first = client.ask("median?", dataset="fp")
+    assert list(client.stream("median?", dataset="fp")) == [first]
+    assert first == "".join(PIECES)
+    assert len(server.requests) == 1
+    # another dataset is another question
+    client.ask("median?", dataset="other")
+    assert len(server.requests) == 2
+
+
+def test_error_status_raises(server, client):
+    server.status = 429
+    with pytest.raises(ChatError) as err:
+        client.ask("median?")
+    assert err.value.status == 429
+    # failures are not cached
+    server.status = 200
+    assert client.ask("median?") == "".join(PIECES)
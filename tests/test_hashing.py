@@ -0,0 +1,16 @@
+"""Column hashes tell apart values that only differ in type."""
+
+import pandas as pd
+
+import insight_engine as ie
+
+
+def test_mixed_types_are_not_duplicates():
+    df = pd.DataFrame({"code": [1, "1", 2, "2"]})
+    assert ie.DatasetProfile.from_frame(df).n_duplicates == df.duplicated().sum() == 0
+
+
+def test_mixed_type_order_changes_the_fingerprint():
+    a = pd.Series([1, "1", 2, "2"])
+    b = pd.Series(["1", 1, "2", 2])
+    assert ie.column_fingerprint(a) != ie.column_fingerprint(b)
@@ -0,0 +1,26 @@
+"""Sample-then-verify results are only reused for the same full frame."""
+
+import numpy as np
+
+import insight_engine as ie
+from bench import make_dataset
+
+
+def test_memo_sees_rows_outside_the_sample():
+    df, _ = make_dataset(6000, seed=1)
+    ie.MEMO.clear()
+    before = ie.run_analysis(df, limit=None, sample_rows=2000).findings
+    assert any(f.kind == "segment_difference" for f in before)
+
+    # erase the planted num2 effect, but only in rows the sample skipped
+    kept = ie.stratified_sample(df, 2000, ie.SAMPLE_SEED).index
+    outside = df.index.difference(kept)
+    changed = df.copy()
+    changed.loc[outside, "num2"] = np.random.default_rng(0).normal(
+        size=len(outside))
+
+    rerun = ie.run_analysis(changed, limit=None, sample_rows=2000).findings
+    ie.MEMO.clear()
+    cold = ie.run_analysis(changed, limit=None, sample_rows=2000).findings
+    assert rerun == cold
+    assert rerun != before